@@ -0,0 +1,80 @@
+"""Benchmark worst-case reveal cascades: scanline fill vs. the old tile stack.
+
+Usage: python benchmarks/bench_flood_fill.py [size] [mines]
+Defaults to a sparse 600 x 600 board with 720 mines, clicked in the middle.
+Opening labels are not computed, so the click goes through the flood fill
+path. Time and peak traced memory are measured in separate runs.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import Board, GameConfig, TileBits  # noqa: E402
+
+
+def stack_reveal(cells, x, y):
+    """The previous reveal_tile: a stack of (x, y) tuples, one per push."""
+    height, width = cells.shape
+    stack = [(x, y)]
+    max_stack = 1
+    while stack:
+        x, y = stack.pop()
+        tile = cells[y, x]
+        if tile & (TileBits.REVEALED | TileBits.FLAGGED):
+            continue
+        cells[y, x] = tile | TileBits.REVEALED
+        if tile & (TileBits.MINE | TileBits.COUNT):
+            continue
+        for i in range(-1, 2):
+            for j in range(-1, 2):
+                nx, ny = x + j, y + i
+                if ((i or j) and 0 <= nx < width and 0 <= ny < height and
+                        not cells[ny, nx] & TileBits.REVEALED):
+                    stack.append((nx, ny))
+        max_stack = max(max_stack, len(stack))
+    return max_stack
+
+
+def measure(label, fill, cells):
+    start = time.perf_counter()
+    fill(cells.copy())
+    elapsed = time.perf_counter() - start
+
+    cells = cells.copy()
+    tracemalloc.start()
+    extra = fill(cells)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed * 1000:10.1f} ms   peak {peak / 1024:10.1f} KiB"
+          + (f"   max stack {extra:,} tuples" if extra else ""))
+    return cells
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    num_mines = int(sys.argv[2]) if len(sys.argv) > 2 else size * size // 500
+    x = y = size // 2
+
+    board = Board(GameConfig.custom(size, size, num_mines))
+    board.place_mines((x, y))
+    board.calculate_neighbor_mines()
+    initial = board.cells.copy()
+
+    def scanline(cells):
+        board.cells = cells
+        board.flood_fill(x, y)
+
+    print(f"board: {size} x {size}, {num_mines:,} mines")
+    scanline_cells = measure("scanline", scanline, initial)
+    stack_cells = measure("stack", lambda cells: stack_reveal(cells, x, y), initial)
+
+    assert (scanline_cells == stack_cells).all(), "fills disagree"
+    revealed = int(((scanline_cells & TileBits.REVEALED) != 0).sum())
+    print(f"revealed {revealed:,} tiles, results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Benchmark for Board.calculate_neighbor_mines on very large boards.
+
+Usage: python benchmarks/bench_neighbor_counts.py [width] [height] [density]
+Defaults to a 10000 x 1000 board (10^7 cells) at 20% mine density.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import Board, GameConfig, TileBits  # noqa: E402
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    density = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+
+    num_mines = int(width * height * density)
+    board = Board(GameConfig.custom(width, height, num_mines))
+
+    # Scatter mines directly so only the counting pass is timed.
+    rng = np.random.default_rng(0)
+    mines = rng.choice(width * height, size=num_mines, replace=False)
+    board.cells.reshape(-1)[mines] = TileBits.MINE
+
+    runs = []
+    for _ in range(5):
+        start = time.perf_counter()
+        board.calculate_neighbor_mines()
+        runs.append(time.perf_counter() - start)
+
+    best = min(runs)
+    print(f"board: {width} x {height} = {width * height:,} cells, {num_mines:,} mines")
+    print(f"calculate_neighbor_mines: best {best * 1000:.1f} ms, "
+          f"median {sorted(runs)[len(runs) // 2] * 1000:.1f} ms "
+          f"({width * height / best / 1e6:.0f} M cells/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark for hammering Restart: in-place reset vs. rebuilding the board.
+
+Usage: python benchmarks/bench_restart.py [restarts] [backend]
+Runs on the Hard preset and on a 1000 x 1000 custom board. For each it
+reports restarts per second and, over a traced run of the same number of
+restarts, the memory still allocated afterwards, the peak above the
+starting point, and how many garbage collections ran.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import Difficulty, GameConfig, GameState, new_board  # noqa: E402
+
+
+def rebuild(state):
+    """What GameState.reset did before: a brand-new board every time."""
+    state.board = new_board(state.config)
+    state.first_click = True
+
+
+def measure(label, restart, config, restarts):
+    state = GameState(config)
+    state.handle_first_click(3, 3)
+    state.board.reveal_tile(3, 3)
+
+    start = time.perf_counter()
+    for _ in range(restarts):
+        restart(state)
+    rate = restarts / (time.perf_counter() - start)
+
+    collections = []
+    gc.callbacks.append(lambda phase, info: phase == "start" and collections.append(info))
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(restarts):
+        restart(state)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.callbacks.pop()
+
+    print(f"  {label:<9} {rate:12,.0f} restarts/s   "
+          f"retained {current - baseline:+7,} B   "
+          f"peak +{peak - baseline:<11,} B   "
+          f"gc runs {len(collections)}")
+
+
+def main():
+    restarts = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    backend = sys.argv[2] if len(sys.argv) > 2 else GameConfig.DEFAULT_BACKEND
+
+    for config in (GameConfig(Difficulty.HARD), GameConfig.custom(1000, 1000, 150000)):
+        config.backend = backend
+        print(f"{restarts:,} restarts, {config.grid_width}x{config.grid_height}, "
+              f"{backend} backend")
+        measure("in place", GameState.reset, config, restarts)
+        measure("rebuild", rebuild, config, restarts)
+
+
+if __name__ == "__main__":
+    main()
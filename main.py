@@ -1,8 +1,12 @@
+from __future__ import annotations
+
+import argparse
 import pygame
-import random
-import time
 from enum import Enum
-from typing import Dict, Tuple, List, Optional
+from typing import Dict, Tuple, Optional
+
+from minesweeper import (BOARD_BACKENDS, Board, BoardDelta, BoardPool, Difficulty,
+                         GameConfig, GameState, TileBits)
 
 
 # --- Enums ---
@@ -11,12 +15,6 @@ class GameMode(Enum):
     IN_GAME = "in_game"
 
 
-class Difficulty(Enum):
-    EASY = "Easy"
-    NORMAL = "Normal"
-    HARD = "Hard"
-
-
 # --- Constants ---
 class Colors:
     BLACK = (0, 0, 0)
@@ -47,139 +45,21 @@ class UIConstants:
 
 
 # --- Configuration ---
-class GameConfig:
-    DIFFICULTY_SETTINGS = {
-        Difficulty.EASY: {"size": (12, 9), "mines": 10},
-        Difficulty.NORMAL: {"size": (18, 14), "mines": 40},
-        Difficulty.HARD: {"size": (32, 18), "mines": 99}
-    }
-
-    def __init__(self, difficulty: Difficulty):
-        self.difficulty = difficulty
-        self.update_settings()
+class WindowConfig(GameConfig):
+    """GameConfig plus the window size the current board needs."""
 
     def update_settings(self):
-        settings = self.DIFFICULTY_SETTINGS[self.difficulty]
-        self.grid_width, self.grid_height = settings["size"]
-        self.num_mines = settings["mines"]
-
+        super().update_settings()
         self.screen_width = (self.grid_width * UIConstants.TILE_SIZE +
                             2 * UIConstants.PANEL_SIDES_WIDTH)
         self.screen_height = (self.grid_height * UIConstants.TILE_SIZE +
                              UIConstants.PANEL_TOP_HEIGHT +
                              UIConstants.PANEL_BOTTOM_HEIGHT)
 
-    def set_difficulty(self, difficulty: Difficulty):
-        self.difficulty = difficulty
-        self.update_settings()
-
-
-# --- Board ---
-class Board:
-    def __init__(self, config: GameConfig):
-        self.config = config
-        self.grid: List[List[Dict]] = []
-        self.create_board()
-
-    def create_board(self):
-        """Creates the game board."""
-        self.grid = [[{
-            'is_mine': False,
-            'is_revealed': False,
-            'is_flagged': False,
-            'neighbor_mines': 0
-        } for _ in range(self.config.grid_width)]
-        for _ in range(self.config.grid_height)]
-
-    def place_mines(self, first_click_pos: Tuple[int, int]):
-        """Places mines randomly on the board, avoiding the first click area."""
-        mines_placed = 0
-        while mines_placed < self.config.num_mines:
-            x = random.randint(0, self.config.grid_width - 1)
-            y = random.randint(0, self.config.grid_height - 1)
-            if (x, y) != first_click_pos and not self.grid[y][x]['is_mine']:
-                self.grid[y][x]['is_mine'] = True
-                mines_placed += 1
-
-    def calculate_neighbor_mines(self):
-        """Calculates the number of neighboring mines for each tile."""
-        for y in range(self.config.grid_height):
-            for x in range(self.config.grid_width):
-                if not self.grid[y][x]['is_mine']:
-                    count = 0
-                    for i in range(-1, 2):
-                        for j in range(-1, 2):
-                            ny, nx = y + i, x + j
-                            if (0 <= ny < self.config.grid_height and
-                                0 <= nx < self.config.grid_width):
-                                if self.grid[ny][nx]['is_mine']:
-                                    count += 1
-                    self.grid[y][x]['neighbor_mines'] = count
-
-    def reveal_tile(self, x: int, y: int):
-        """Reveals a tile and iteratively reveals neighbors if it's empty."""
-        if not (0 <= x < self.config.grid_width and
-                0 <= y < self.config.grid_height):
-            return
-
-        stack = [(x, y)]
-
-        while stack:
-            x, y = stack.pop()
-            tile = self.grid[y][x]
-
-            if tile['is_revealed'] or tile['is_flagged']:
-                continue
-
-            tile['is_revealed'] = True
-
-            if tile['is_mine']:
-                continue
-
-            if tile['neighbor_mines'] == 0:
-                for i in range(-1, 2):
-                    for j in range(-1, 2):
-                        if i == 0 and j == 0:
-                            continue
-                        nx, ny = x + j, y + i
-                        if (0 <= nx < self.config.grid_width and
-                            0 <= ny < self.config.grid_height):
-                            if not self.grid[ny][nx]['is_revealed']:
-                                stack.append((nx, ny))
-
-    def reveal_all_mines(self):
-        """Reveals all mines on the board."""
-        for row in self.grid:
-            for tile in row:
-                if tile['is_mine']:
-                    tile['is_revealed'] = True
-
-    def toggle_flag(self, x: int, y: int) -> bool:
-        """Toggles flag on a tile. Returns True if successful."""
-        if (0 <= x < self.config.grid_width and
-            0 <= y < self.config.grid_height):
-            if not self.grid[y][x]['is_revealed']:
-                self.grid[y][x]['is_flagged'] = not self.grid[y][x]['is_flagged']
-                return True
-        return False
-
-    def check_victory(self) -> bool:
-        """Checks if all non-mine tiles have been revealed."""
-        for y in range(self.config.grid_height):
-            for x in range(self.config.grid_width):
-                tile = self.grid[y][x]
-                if not tile['is_mine'] and not tile['is_revealed']:
-                    return False
-        return True
-
-    def count_flags(self) -> int:
-        """Counts the number of flags placed on the board."""
-        return sum(tile['is_flagged'] for row in self.grid for tile in row)
-
 
 # --- UI Renderer ---
 class UIRenderer:
-    def __init__(self, config: GameConfig):
+    def __init__(self, config: WindowConfig):
         self.config = config
         self.font = pygame.font.Font(None, 36)
         self.tile_font = pygame.font.Font(None, UIConstants.TILE_SIZE)
@@ -189,6 +69,14 @@ class UIRenderer:
         self.restart_button_rect: Optional[pygame.Rect] = None
         self.update_button_positions()
 
+        # Tiles are drawn once onto board_surface; afterwards only tiles
+        # named in the board's deltas are redrawn.
+        self.board_surface: Optional[pygame.Surface] = None
+        self.rendered_board = None
+        self.rendered_generation = -1
+        self.dirty_tiles: Dict[int, int] = {}
+        self.glyphs: Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface] = {}
+
     def update_button_positions(self):
         """Calculates the positions of the game buttons."""
         total_button_width = (UIConstants.GAME_BUTTON_WIDTH * 2 +
@@ -256,58 +144,39 @@ class UIRenderer:
             text_rect = text.get_rect(center=button_rect.center)
             screen.blit(text, text_rect)
 
+    def on_board_change(self, delta: BoardDelta):
+        """Queues the tiles of a board delta for redrawing."""
+        self.dirty_tiles.update(delta)
+
     def draw_board(self, screen: pygame.Surface, board: Board):
-        """Draws the game board."""
+        """Draws the game board, redrawing only the tiles changed since the last frame."""
         board_start_x = UIConstants.PANEL_SIDES_WIDTH
         board_start_y = UIConstants.PANEL_TOP_HEIGHT
 
-        for y in range(self.config.grid_height):
-            for x in range(self.config.grid_width):
-                rect = pygame.Rect(
-                    board_start_x + x * UIConstants.TILE_SIZE,
-                    board_start_y + y * UIConstants.TILE_SIZE,
-                    UIConstants.TILE_SIZE,
-                    UIConstants.TILE_SIZE
-                )
-
-                tile = board.grid[y][x]
-
-                if tile['is_revealed']:
-                    pygame.draw.rect(screen, Colors.LIGHT_GRAY, rect)
-                    if tile['is_mine']:
-                        pygame.draw.ellipse(screen, Colors.RED, rect)
-                    elif tile['neighbor_mines'] > 0:
-                        text = self.tile_font.render(
-                            str(tile['neighbor_mines']),
-                            True,
-                            Colors.BLACK
-                        )
-                        screen.blit(text, (
-                            rect.x + (UIConstants.TILE_SIZE - text.get_width()) // 2,
-                            rect.y + (UIConstants.TILE_SIZE - text.get_height()) // 2
-                        ))
-                else:
-                    # Draw 3D-like button for unrevealed tiles
-                    pygame.draw.rect(screen, Colors.GRAY, rect)
-                    pygame.draw.line(screen, Colors.WHITE,
-                                   (rect.left, rect.top),
-                                   (rect.right - 1, rect.top), 2)
-                    pygame.draw.line(screen, Colors.WHITE,
-                                   (rect.left, rect.top),
-                                   (rect.left, rect.bottom - 1), 2)
-                    pygame.draw.line(screen, Colors.BLACK,
-                                   (rect.left, rect.bottom - 1),
-                                   (rect.right - 1, rect.bottom - 1), 2)
-                    pygame.draw.line(screen, Colors.BLACK,
-                                   (rect.right - 1, rect.top),
-                                   (rect.right - 1, rect.bottom - 1), 2)
-
-                    if tile['is_flagged']:
-                        flag_text = self.tile_font.render('F', True, Colors.BLUE)
-                        screen.blit(flag_text, (
-                            rect.x + (UIConstants.TILE_SIZE - flag_text.get_width()) // 2,
-                            rect.y + (UIConstants.TILE_SIZE - flag_text.get_height()) // 2
-                        ))
+        if board is not self.rendered_board:
+            if self.rendered_board is not None:
+                self.rendered_board.unsubscribe(self.on_board_change)
+            board.subscribe(self.on_board_change)
+            self.rendered_board = board
+            self.rendered_generation = -1
+
+        if board.generation != self.rendered_generation:
+            self.rendered_generation = board.generation
+            surface_size = (self.config.grid_width * UIConstants.TILE_SIZE,
+                            self.config.grid_height * UIConstants.TILE_SIZE)
+            if self.board_surface is None or self.board_surface.get_size() != surface_size:
+                self.board_surface = pygame.Surface(surface_size)
+            self.dirty_tiles.clear()
+            for y in range(self.config.grid_height):
+                for x in range(self.config.grid_width):
+                    self.draw_tile(x, y, board.tile_state(x, y))
+        else:
+            for index, state in self.dirty_tiles.items():
+                y, x = divmod(index, self.config.grid_width)
+                self.draw_tile(x, y, state)
+            self.dirty_tiles.clear()
+
+        screen.blit(self.board_surface, (board_start_x, board_start_y))
 
         # Draw grid lines
         for i in range(self.config.grid_width + 1):
@@ -325,6 +194,53 @@ class UIRenderer:
                  board_start_y + i * UIConstants.TILE_SIZE)
             )
 
+    def draw_tile(self, x: int, y: int, tile: int):
+        """Draws one tile onto the cached board surface."""
+        surface = self.board_surface
+        rect = pygame.Rect(
+            x * UIConstants.TILE_SIZE,
+            y * UIConstants.TILE_SIZE,
+            UIConstants.TILE_SIZE,
+            UIConstants.TILE_SIZE
+        )
+
+        if tile & TileBits.REVEALED:
+            pygame.draw.rect(surface, Colors.LIGHT_GRAY, rect)
+            if tile & TileBits.MINE:
+                pygame.draw.ellipse(surface, Colors.RED, rect)
+            elif tile & TileBits.COUNT:
+                self.blit_glyph(surface, rect, str(tile & TileBits.COUNT), Colors.BLACK)
+        else:
+            # Draw 3D-like button for unrevealed tiles
+            pygame.draw.rect(surface, Colors.GRAY, rect)
+            pygame.draw.line(surface, Colors.WHITE,
+                           (rect.left, rect.top),
+                           (rect.right - 1, rect.top), 2)
+            pygame.draw.line(surface, Colors.WHITE,
+                           (rect.left, rect.top),
+                           (rect.left, rect.bottom - 1), 2)
+            pygame.draw.line(surface, Colors.BLACK,
+                           (rect.left, rect.bottom - 1),
+                           (rect.right - 1, rect.bottom - 1), 2)
+            pygame.draw.line(surface, Colors.BLACK,
+                           (rect.right - 1, rect.top),
+                           (rect.right - 1, rect.bottom - 1), 2)
+
+            if tile & TileBits.FLAGGED:
+                self.blit_glyph(surface, rect, 'F', Colors.BLUE)
+
+    def blit_glyph(self, surface: pygame.Surface, rect: pygame.Rect, text: str,
+                   color: Tuple[int, int, int]):
+        """Blits a cached tile glyph centered in rect."""
+        key = (text, color)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            glyph = self.glyphs[key] = self.tile_font.render(text, True, color)
+        surface.blit(glyph, (
+            rect.x + (UIConstants.TILE_SIZE - glyph.get_width()) // 2,
+            rect.y + (UIConstants.TILE_SIZE - glyph.get_height()) // 2
+        ))
+
     def draw_ui_frame(self, screen: pygame.Surface, elapsed_time: float, mines_left: int):
         """Draws the UI frame around the game board."""
         # Draw panels
@@ -427,50 +343,20 @@ class SoundManager:
         self.current_playing = None
 
 
-# --- Game State ---
-class GameState:
-    def __init__(self, config: GameConfig):
-        self.config = config
-        self.board = Board(config)
-        self.first_click = True
-        self.game_over = False
-        self.game_won = False
-        self.start_time = 0
-
-    def reset(self):
-        """Resets the game state."""
-        self.board = Board(self.config)
-        self.first_click = True
-        self.game_over = False
-        self.game_won = False
-        self.start_time = 0
-
-    def handle_first_click(self, x: int, y: int):
-        """Handles the first click by placing mines and calculating neighbors."""
-        if self.first_click:
-            self.start_time = time.time()
-            self.board.place_mines((x, y))
-            self.board.calculate_neighbor_mines()
-            self.first_click = False
-
-    def get_elapsed_time(self) -> float:
-        """Returns elapsed time since game start."""
-        if self.start_time > 0 and not self.game_over and not self.game_won:
-            return time.time() - self.start_time
-        return 0
-
-    def get_mines_left(self) -> int:
-        """Returns number of mines left (total mines - flags placed)."""
-        return self.config.num_mines - self.board.count_flags()
-
-
 # --- Main Game ---
 class Game:
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None, seed: Optional[int] = None,
+                 practice: bool = False):
         pygame.init()
         pygame.display.set_caption("Minesweeper")
 
-        self.config = GameConfig(Difficulty.EASY)
+        self.config = WindowConfig(Difficulty.EASY)
+        if backend:
+            self.config.backend = backend
+        self.config.seed = seed
+        self.config.practice = practice
+        self.board_pool = BoardPool()
+        self.board_pool.start(self.config.backend)
         self.game_mode = GameMode.MAIN_MENU
         self.game_state: Optional[GameState] = None
         self.ui_renderer = UIRenderer(self.config)
@@ -488,8 +374,11 @@ class Game:
     def start_game(self, difficulty: Difficulty):
         """Starts a new game with the specified difficulty."""
         self.config.set_difficulty(difficulty)
-        self.ui_renderer = UIRenderer(self.config)
-        self.game_state = GameState(self.config)
+        self.ui_renderer.update_button_positions()
+        if self.game_state is None:
+            self.game_state = GameState(self.config, self.board_pool)
+        else:
+            self.game_state.reset()
         self.game_mode = GameMode.IN_GAME
 
         self.screen = pygame.display.set_mode(
@@ -501,8 +390,8 @@ class Game:
 
     def return_to_menu(self):
         """Returns to the main menu."""
+        # The game state is kept so the next game can reuse its buffers.
         self.game_mode = GameMode.MAIN_MENU
-        self.game_state = None
 
         self.screen = pygame.display.set_mode(
             (UIConstants.MAIN_MENU_WIDTH, UIConstants.MAIN_MENU_HEIGHT),
@@ -535,7 +424,13 @@ class Game:
         if not self.game_state:
             return
 
-        if event.type == pygame.MOUSEBUTTONDOWN:
+        if event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL:
+            if event.key == pygame.K_z:
+                self.game_state.undo()
+            elif event.key == pygame.K_y:
+                self.game_state.redo()
+
+        elif event.type == pygame.MOUSEBUTTONDOWN:
             pos = pygame.mouse.get_pos()
 
             # Check UI buttons
@@ -556,14 +451,12 @@ class Game:
                 if (0 <= x < self.config.grid_width and
                     0 <= y < self.config.grid_height):
 
-                    if event.button == 1:  # Left click
-                        self.game_state.handle_first_click(x, y)
-                        self.game_state.board.reveal_tile(x, y)
+                    left, _, right = pygame.mouse.get_pressed()[:3]
+                    if event.button == 2 or (left and right):  # Chord
+                        self.game_state.chord(x, y)
 
-                        tile = self.game_state.board.grid[y][x]
-                        if tile['is_mine'] and not tile['is_flagged']:
-                            self.game_state.game_over = True
-                            self.game_state.board.reveal_all_mines()
+                    elif event.button == 1:  # Left click
+                        self.game_state.reveal(x, y)
 
                     elif event.button == 3:  # Right click
                         self.game_state.board.toggle_flag(x, y)
@@ -633,6 +526,7 @@ class Game:
             self.render()
             self.clock.tick(60)
 
+        self.board_pool.stop()
         self.sound_manager.stop_all()
         pygame.quit()
 
@@ -640,7 +534,17 @@ class Game:
 # --- Entry Point ---
 def main():
     """Entry point for the game."""
-    game = Game()
+    parser = argparse.ArgumentParser(description="Minesweeper")
+    parser.add_argument("--engine", choices=sorted(BOARD_BACKENDS),
+                        default=GameConfig.DEFAULT_BACKEND,
+                        help="board backend (default: %(default)s)")
+    parser.add_argument("--seed", type=int,
+                        help="generate reproducible boards from this seed")
+    parser.add_argument("--practice", action="store_true",
+                        help="practice mode: Ctrl+Z / Ctrl+Y undo and redo moves")
+    args = parser.parse_args()
+
+    game = Game(backend=args.engine, seed=args.seed, practice=args.practice)
     game.run()
 
 
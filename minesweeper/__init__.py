@@ -0,0 +1,64 @@
+"""Headless Minesweeper engine.
+
+Nothing here imports pygame. Submodules are loaded on first attribute
+access, so ``import minesweeper`` is nearly free and a worker only pays for
+the backends it actually touches (NumPy is imported by the first module
+that needs it).
+"""
+from __future__ import annotations
+
+import importlib
+
+_EXPORTS = {
+    "Difficulty": "config",
+    "GameConfig": "config",
+    "TileBits": "config",
+    "Topology": "geometry",
+    "SquareTopology": "geometry",
+    "TorusTopology": "geometry",
+    "HexTopology": "geometry",
+    "CubeTopology": "geometry",
+    "parse_topology": "geometry",
+    "BoardGeometry": "geometry",
+    "GEOMETRY_CACHE": "geometry",
+    "seeded_mines": "seeding",
+    "BoardDelta": "feed",
+    "ChangeFeed": "feed",
+    "FeedFollower": "feed",
+    "zobrist_hash": "feed",
+    "MoveJournal": "journal",
+    "BoardSnapshot": "snapshot",
+    "safe_zone": "board",
+    "Board": "board",
+    "MemmapBoard": "memmap",
+    "BitBoard": "bitboard",
+    "ChunkStore": "infinite",
+    "InfiniteBoard": "infinite",
+    "BOARD_BACKENDS": "backends",
+    "new_board": "backends",
+    "BoardPool": "pool",
+    "RectIndex": "index",
+    "Frontier": "frontier",
+    "Solver": "solver",
+    "ComponentTooLarge": "probability",
+    "MineProbabilities": "probability",
+    "mine_probabilities": "probability",
+    "GameState": "state",
+    "MoveResult": "state",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Imports the submodule defining name on first access and caches it."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
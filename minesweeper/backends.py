@@ -0,0 +1,24 @@
+"""Registry of board backends."""
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:  # Only the "bitboard" backend is available without NumPy.
+    np = None
+
+from .config import GameConfig
+from .board import Board
+from .bitboard import BitBoard
+
+
+BOARD_BACKENDS = {
+    "numpy": Board,
+    "bitboard": BitBoard,
+}
+
+
+def new_board(config: GameConfig):
+    """Creates an empty board using the backend selected in config."""
+    if config.backend == "numpy" and np is None:
+        raise RuntimeError("The numpy board backend requires NumPy; use --engine bitboard")
+    return BOARD_BACKENDS[config.backend](config)
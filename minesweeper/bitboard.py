@@ -0,0 +1,355 @@
+"""Pure-Python board engine built on big-integer bit planes."""
+from __future__ import annotations
+
+import copy
+import random
+import re
+from array import array
+from typing import Callable, Tuple, List, Optional
+
+from .config import GameConfig, TileBits
+from .geometry import GEOMETRY_CACHE
+from .seeding import seeded_mines
+from .feed import BoardDelta, ChangeFeed
+from .board import safe_zone
+
+
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def bit_positions(plane: int) -> List[int]:
+    """Returns the positions of the set bits of a non-negative int, ascending."""
+    data = plane.to_bytes((plane.bit_length() + 7) // 8, 'little')
+    positions = []
+    for match in re.finditer(rb'[^\x00]', data):
+        base = match.start() * 8
+        positions.extend(base + bit for bit in _BYTE_BITS[data[match.start()]])
+    return positions
+
+
+def plane_from_bits(bits) -> int:
+    """Inverse of bit_positions: builds an int with the given bits set."""
+    bits = list(bits)
+    if not bits:
+        return 0
+    data = bytearray(max(bits) // 8 + 1)
+    for bit in bits:
+        data[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(data, 'little')
+
+
+class BitBoard(ChangeFeed):
+    """Board backend built on Python integers, for installs without NumPy.
+
+    The mine, revealed and flagged planes are each one arbitrary-precision
+    int with bit (y * stride + x) per tile. Rows are padded with one
+    always-clear guard bit (stride = grid_width + 1) so horizontal shifts
+    never carry into the next row. Neighbor counts live in four bit-sliced
+    planes, cascades are repeated masked dilations, and the victory and
+    flag queries are single mask operations.
+    """
+
+    def __init__(self, config: GameConfig):
+        if config.topology != "square":
+            raise ValueError("The bitboard backend only supports the square topology")
+        self.config = config
+        self.geometry = GEOMETRY_CACHE.get(config.grid_width, config.grid_height)
+        self.subscribers: List[Callable[[BoardDelta], None]] = []
+        self.stride = config.grid_width + 1
+        self.board_mask = 0
+        self.mines = 0
+        self.revealed = 0
+        self.flagged = 0
+        self.count_planes = [0, 0, 0, 0]
+        self.zobrist = 0
+        self.generation = 0
+        self.create_board()
+
+    def create_board(self):
+        """Creates the game board."""
+        self.geometry = GEOMETRY_CACHE.get(self.config.grid_width, self.config.grid_height)
+        self.stride = self.config.grid_width + 1
+        self.board_mask = self.geometry.bit_mask
+        self.mines = 0
+        self.revealed = 0
+        self.flagged = 0
+        for i in range(len(self.count_planes)):
+            self.count_planes[i] = 0
+        self.zobrist = 0
+
+    def reset(self):
+        """Clears the board for a new game; bumps `generation` like Board.reset."""
+        self.create_board()
+        self.generation += 1
+
+    def fork(self) -> 'BitBoard':
+        """Returns an O(1) copy-on-write fork.
+
+        Planes are immutable ints that every mutation replaces, so the fork
+        shares them with this board until either side writes.
+        """
+        twin = copy.copy(self)
+        twin.subscribers = []
+        twin.count_planes = list(self.count_planes)
+        return twin
+
+    def bit(self, x: int, y: int) -> int:
+        """Returns the single-bit mask of a tile."""
+        return 1 << (y * self.stride + x)
+
+    def dilate(self, plane: int) -> int:
+        """Returns plane grown by one tile in all eight directions."""
+        row = plane | (plane << 1) | (plane >> 1)
+        return (row | (row << self.stride) | (row >> self.stride)) & self.board_mask
+
+    def place_mines(self, first_click_pos: Optional[Tuple[int, int]]):
+        """Places mines randomly on the board, avoiding the first click area."""
+        width = self.config.grid_width
+        num_mines = self.config.num_mines
+
+        excluded, available = safe_zone(self.config, first_click_pos)
+        if self.config.seed is not None:
+            plane = 0
+            for index in seeded_mines(self.config, excluded):
+                plane |= 1 << (index // width * self.stride + index % width)
+            self.mines = plane
+            return
+
+        dense = num_mines * 2 > available
+        sample_size = available - num_mines if dense else num_mines
+        plane = 0
+        for index in random.sample(range(available), sample_size):
+            for cell in excluded:
+                if index >= cell:
+                    index += 1
+            plane |= 1 << (index // width * self.stride + index % width)
+
+        if dense:
+            for cell in excluded:
+                plane |= 1 << (cell // width * self.stride + cell % width)
+            plane = self.board_mask & ~plane
+        self.mines = plane
+
+    def move_mines(self, removed: List[int], added: List[int]):
+        """Moves mines off the removed flat tiles onto the added ones, then recounts."""
+        width = self.config.grid_width
+        for index in removed:
+            self.mines &= ~self.bit(index % width, index // width)
+        for index in added:
+            self.mines |= self.bit(index % width, index // width)
+        self.calculate_neighbor_mines()
+
+    def load_layout(self, source: 'BitBoard'):
+        """Copies the mines and counts of a prepared board; flags are kept."""
+        self.mines = source.mines
+        for i, plane in enumerate(source.count_planes):
+            self.count_planes[i] = plane
+
+    def calculate_neighbor_mines(self):
+        """Calculates the number of neighboring mines for each tile.
+
+        The eight shifted mine planes are summed with a ripple-carry adder
+        into four bit planes holding the count in binary.
+        """
+        mines, stride, mask = self.mines, self.stride, self.board_mask
+        row = (mines << 1, mines >> 1)
+        shifted = [*row] + [plane << stride for plane in (mines, *row)] + \
+                  [plane >> stride for plane in (mines, *row)]
+
+        planes = [0, 0, 0, 0]
+        for carry in shifted:
+            carry &= mask
+            for i in range(4):
+                planes[i], carry = planes[i] ^ carry, planes[i] & carry
+        self.count_planes = [plane & ~mines for plane in planes]
+
+    def label_openings(self):
+        """Kept for API parity with Board; cascades here are already bulk."""
+
+    @property
+    def num_openings(self) -> int:
+        """Number of openings (connected regions of zero tiles)."""
+        zero = self.board_mask & ~(self.mines | self.numbered_mask())
+        count = 0
+        while zero:
+            region = zero & -zero
+            while True:
+                grown = self.dilate(region) & zero
+                if grown == region:
+                    break
+                region = grown
+            zero &= ~region
+            count += 1
+        return count
+
+    def numbered_mask(self) -> int:
+        """Returns the plane of tiles with at least one neighboring mine."""
+        return self.count_planes[0] | self.count_planes[1] | \
+            self.count_planes[2] | self.count_planes[3]
+
+    def reveal_tile(self, x: int, y: int) -> BoardDelta:
+        """Reveals a tile and iteratively reveals neighbors if it's empty."""
+        if not (0 <= x < self.config.grid_width and
+                0 <= y < self.config.grid_height):
+            return BoardDelta()
+        return self.publish(self.make_delta(self.open_tiles(self.bit(x, y))))
+
+    def reveal_many(self, cells) -> BoardDelta:
+        """Reveals every listed tile, cascading as usual, as one published delta.
+
+        cells is an iterable of (x, y) pairs; tiles off the board, already
+        revealed or flagged are skipped. All cascades grow together.
+        """
+        return self.publish(self.make_delta(self.open_tiles(self.cell_plane(cells))))
+
+    def cell_plane(self, cells) -> int:
+        """Returns the plane of the on-board (x, y) cells."""
+        width, height = self.config.grid_width, self.config.grid_height
+        return plane_from_bits(int(y) * self.stride + int(x) for x, y in cells
+                               if 0 <= x < width and 0 <= y < height)
+
+    def open_tiles(self, seeds: int) -> int:
+        """Reveals the seed tiles and their cascades without publishing.
+
+        Seeds that are revealed or flagged are ignored. Returns the mask
+        of newly revealed tiles.
+        """
+        closed = self.board_mask & ~(self.revealed | self.flagged)
+        seeds &= closed
+        if not seeds:
+            return 0
+
+        # Grow the region through hidden, unflagged zero tiles, then reveal
+        # it together with the hidden, unflagged tiles around it.
+        cascading = closed & ~(self.mines | self.numbered_mask())
+        region = seeds & cascading
+        while True:
+            grown = (self.dilate(region) & cascading) | region
+            if grown == region:
+                break
+            region = grown
+        changed = seeds | (self.dilate(region) & closed) if region else seeds
+        self.revealed |= changed
+        return changed
+
+    def chord(self, x: int, y: int) -> BoardDelta:
+        """Reveals the hidden neighbors of a number whose flags are all placed, as one delta."""
+        if not (0 <= x < self.config.grid_width and
+                0 <= y < self.config.grid_height):
+            return BoardDelta()
+
+        tile = self.bit(x, y)
+        count = self.tile_state(x, y) & TileBits.COUNT
+        if not self.revealed & tile or self.mines & tile or not count:
+            return BoardDelta()
+
+        neighbors = self.dilate(tile) & ~tile
+        if (neighbors & self.flagged).bit_count() != count:
+            return BoardDelta()
+        return self.publish(self.make_delta(self.open_tiles(neighbors)))
+
+    def reveal_all_mines(self) -> BoardDelta:
+        """Reveals all mines on the board."""
+        changed = self.mines & ~self.revealed
+        self.revealed |= changed
+        return self.publish(self.make_delta(changed))
+
+    def toggle_flag(self, x: int, y: int) -> BoardDelta:
+        """Toggles flag on a tile. Returns the change, empty if nothing happened."""
+        if (0 <= x < self.config.grid_width and
+            0 <= y < self.config.grid_height):
+            tile = self.bit(x, y)
+            if not self.revealed & tile:
+                self.flagged ^= tile
+                return self.publish(self.make_delta(tile))
+        return BoardDelta()
+
+    def flag_many(self, cells, flagged: bool = True) -> BoardDelta:
+        """Sets or clears the flag on every listed hidden tile as one published delta.
+
+        Unlike toggle_flag this is idempotent: tiles off the board, revealed
+        or already in the requested state are skipped.
+        """
+        targets = self.cell_plane(cells) & ~self.revealed
+        changed = targets & ~self.flagged if flagged else targets & self.flagged
+        self.flagged ^= changed
+        return self.publish(self.make_delta(changed))
+
+    def apply_states(self, delta: BoardDelta) -> BoardDelta:
+        """Sets the REVEALED and FLAGGED bits of tiles to the visible states in delta.
+
+        Used to undo and redo moves; mines and counts are left alone. The
+        change is published like any other mutation.
+        """
+        width = self.config.grid_width
+        bits = [index + index // width for index in delta.indices]
+        changed = plane_from_bits(bits)
+        previous = self.make_delta(changed).states
+        self.revealed = (self.revealed & ~changed) | plane_from_bits(
+            bit for bit, state in zip(bits, delta.states) if state & TileBits.REVEALED)
+        self.flagged = (self.flagged & ~changed) | plane_from_bits(
+            bit for bit, state in zip(bits, delta.states) if state & TileBits.FLAGGED)
+        return self.publish(self.make_delta(changed), previous)
+
+    def make_delta(self, changed: int) -> BoardDelta:
+        """Builds a BoardDelta from the current state of the tiles set in changed."""
+        bits = bit_positions(changed)
+        states = dict.fromkeys(bits, 0)
+        visible = changed & self.revealed
+        layers = [(plane, 1 << i) for i, plane in enumerate(self.count_planes)]
+        layers += [(self.mines, TileBits.MINE), (self.revealed, TileBits.REVEALED)]
+        for plane, value in layers:
+            for bit in bit_positions(plane & visible):
+                states[bit] |= value
+        for bit in bit_positions(self.flagged & changed):
+            states[bit] |= TileBits.FLAGGED
+        return BoardDelta(array('q', [bit - bit // self.stride for bit in bits]),
+                          bytes(states.values()))
+
+    def full_delta(self) -> BoardDelta:
+        """Returns an unpublished delta of every tile in its current visible state."""
+        return self.make_delta(self.board_mask)
+
+    def check_victory(self) -> bool:
+        """Checks if all non-mine tiles have been revealed."""
+        return (self.revealed | self.mines) == self.board_mask
+
+    def count_flags(self) -> int:
+        """Counts the number of flags placed on the board."""
+        return self.flagged.bit_count()
+
+    @property
+    def safe_tiles_left(self) -> int:
+        """Number of safe tiles still hidden."""
+        return (self.board_mask & ~(self.revealed | self.mines)).bit_count()
+
+    @property
+    def flags_placed(self) -> int:
+        """Number of flags on the board."""
+        return self.flagged.bit_count()
+
+    def tile_state(self, x: int, y: int) -> int:
+        """Returns the packed TileBits value of a tile."""
+        shift = y * self.stride + x
+        state = 0
+        for i, plane in enumerate(self.count_planes):
+            state |= ((plane >> shift) & 1) << i
+        if (self.mines >> shift) & 1:
+            state |= TileBits.MINE
+        if (self.revealed >> shift) & 1:
+            state |= TileBits.REVEALED
+        if (self.flagged >> shift) & 1:
+            state |= TileBits.FLAGGED
+        return state
+
+    def is_mine(self, x: int, y: int) -> bool:
+        """Returns True if the tile holds a mine."""
+        return bool(self.mines & self.bit(x, y))
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        """Returns True if the tile has been revealed."""
+        return bool(self.revealed & self.bit(x, y))
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        """Returns True if the tile carries a flag."""
+        return bool(self.flagged & self.bit(x, y))
@@ -0,0 +1,650 @@
+"""The NumPy board engine."""
+from __future__ import annotations
+
+import random
+import weakref
+from array import array
+from typing import Callable, Dict, Tuple, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Only the "bitboard" backend is available without NumPy.
+    np = None
+
+from .config import GameConfig, TileBits
+from .geometry import GEOMETRY_CACHE
+from .seeding import seeded_mines
+from .feed import BoardDelta, ChangeFeed, zobrist_hash
+from .snapshot import BoardSnapshot, SnapshotSource
+
+
+def safe_zone(config: GameConfig,
+              first_click_pos: Optional[Tuple[int, int]]) -> Tuple[List[int], int]:
+    """Returns the sorted flat indices kept free of mines and the tile count left.
+
+    The zone is the square of config.safe_zone_radius around the first
+    click (on other topologies, the tiles that many neighbor steps away),
+    shrunk to the clicked tile alone when it would leave fewer free tiles
+    than config.num_mines. Without a click there is no zone.
+    """
+    width, height = config.grid_width, config.grid_height
+    if first_click_pos is None:
+        return [], width * height
+    x, y = first_click_pos
+    for radius in (config.safe_zone_radius, 0):
+        if config.topology == "square":
+            excluded = [row * width + col
+                        for row in range(max(y - radius, 0), min(y + radius + 1, height))
+                        for col in range(max(x - radius, 0), min(x + radius + 1, width))]
+        else:
+            # Tiles within `radius` neighbor steps of the click.
+            geometry = GEOMETRY_CACHE.get(width, height, config.topology)
+            zone = frontier = {y * width + x}
+            for _ in range(radius):
+                frontier = {int(j) for i in frontier for j in geometry.neighbors(i)} - zone
+                zone = zone | frontier
+            excluded = sorted(zone)
+        available = width * height - len(excluded)
+        if config.num_mines <= available:
+            return excluded, available
+    raise ValueError(
+        f"Cannot place {config.num_mines} mines on a {width}x{height} board"
+    )
+
+
+def uncompact(positions: np.ndarray, excluded: List[int]) -> np.ndarray:
+    """Maps positions among the tiles outside excluded (sorted) to flat tile indices.
+
+    Compacted position c lands on tile c + #{j : excluded[j] - j <= c}.
+    """
+    steps = np.array(excluded, dtype=np.int64) - np.arange(len(excluded))
+    return positions + np.searchsorted(steps, positions, side="right")
+
+
+class Board(SnapshotSource, ChangeFeed):
+    """Game board stored as one packed uint8 plane (see TileBits).
+
+    Row-major with shape (grid_height, grid_width), so a 1000x1000 board
+    takes 1 MB and whole-board queries run as NumPy reductions. The number
+    of hidden safe tiles and of placed flags are kept as running counters
+    so check_victory and count_flags are O(1). fork() gives copy-on-write
+    snapshots (see BoardSnapshot); every write goes through detach_rows.
+    """
+
+    def __init__(self, config: GameConfig):
+        self.config = config
+        self.geometry = GEOMETRY_CACHE.get(config.grid_width, config.grid_height, config.topology)
+        self.subscribers: List[Callable[[BoardDelta], None]] = []
+        self.snapshots: weakref.WeakSet = weakref.WeakSet()
+        self.cells: np.ndarray = np.zeros((0, 0), dtype=np.uint8)
+        self.safe_tiles_left = 0
+        self.flags_placed = 0
+        self.zobrist = 0
+        # Opening tables: each tile's 1-based opening label (0 outside any),
+        # and opening l's zero tiles then border as a slice of opening_cells
+        # between opening_offsets[l - 1] and opening_offsets[l].
+        self.opening_labels: Optional[np.ndarray] = None
+        self.opening_cells: Optional[np.ndarray] = None
+        self.opening_offsets: Optional[np.ndarray] = None
+        self.generation = 0
+        self.create_board()
+
+    def create_board(self):
+        """Creates the game board."""
+        self.geometry = GEOMETRY_CACHE.get(self.config.grid_width, self.config.grid_height,
+                                           self.config.topology)
+        self.cells = np.zeros(
+            (self.config.grid_height, self.config.grid_width),
+            dtype=np.uint8
+        )
+        self.clear_state()
+
+    def reset(self):
+        """Clears the board for a new game, reusing its buffers when the size is unchanged.
+
+        Subscribers receive no delta for this; they can compare
+        `generation`, which every reset bumps, to notice it.
+        """
+        self.detach_rows(0, self.cells.shape[0])
+        if self.cells.shape == (self.config.grid_height, self.config.grid_width):
+            self.cells.fill(0)
+            self.clear_state()
+        else:
+            self.create_board()
+        self.generation += 1
+
+    def clear_state(self):
+        """Resets the counters and opening tables for an empty plane."""
+        self.safe_tiles_left = self.cells.size - self.config.num_mines
+        self.flags_placed = 0
+        self.zobrist = 0
+        self.opening_labels = None
+        self.opening_cells = None
+        self.opening_offsets = None
+
+    def place_mines(self, first_click_pos: Optional[Tuple[int, int]]):
+        """Places mines randomly on the board, avoiding the first click area.
+
+        Seeded configs use seeded_mines instead.
+        """
+        height = self.config.grid_height
+        num_mines = self.config.num_mines
+
+        excluded, available = safe_zone(self.config, first_click_pos)
+        self.detach_rows(0, height)
+        if self.config.seed is not None:
+            self.cells.reshape(-1)[seeded_mines(self.config, excluded)] |= TileBits.MINE
+            return
+
+        dense = num_mines * 2 > available
+        sample_size = available - num_mines if dense else num_mines
+        # Drawn from the random module's state, so random.seed still
+        # reproduces a layout.
+        rng = np.random.default_rng(random.getrandbits(64))
+        positions = rng.choice(available, sample_size, replace=False, shuffle=False)
+        indices = uncompact(positions.astype(np.int64), excluded)
+
+        flat = self.cells.reshape(-1)
+        if dense:
+            flat |= TileBits.MINE
+            flat[excluded] &= np.uint8(0xFF ^ TileBits.MINE)
+            flat[indices] &= np.uint8(0xFF ^ TileBits.MINE)
+        else:
+            flat[indices] |= TileBits.MINE
+
+    def move_mines(self, removed: List[int], added: List[int]):
+        """Moves mines off the removed flat tiles onto the added ones, then recounts."""
+        flat = self.cells.reshape(-1)
+        self.detach_rows(0, self.cells.shape[0])
+        flat[removed] &= np.uint8(0xFF ^ TileBits.MINE)
+        flat[added] |= TileBits.MINE
+        self.calculate_neighbor_mines()
+        self.label_openings()
+
+    def load_layout(self, source: 'Board'):
+        """Copies the mines, counts and openings of a prepared board; flags are kept."""
+        self.detach_rows(0, self.cells.shape[0])
+        flags = self.cells & TileBits.FLAGGED
+        np.copyto(self.cells, source.cells)
+        self.cells |= flags
+        self.opening_labels = source.opening_labels
+        self.opening_cells = source.opening_cells
+        self.opening_offsets = source.opening_offsets
+
+    def calculate_neighbor_mines(self):
+        """Calculates the number of neighboring mines for each tile. Mine tiles keep 0."""
+        if not self.geometry.square:
+            self.gather_counts()
+            return
+        self.count_rows(0, self.cells.shape[0])
+
+    def gather_counts(self):
+        """Counts neighbor mines through the padded neighbor table, for any topology."""
+        flat = self.cells.reshape(-1)
+        mines = (flat & TileBits.MINE) >> 4
+        padded = np.append(mines, np.uint8(0))
+        counts = np.zeros(flat.size, dtype=np.uint8)
+        for slot in self.geometry.neighbor_table:
+            counts += padded[slot]
+        counts[mines != 0] = 0
+        self.detach_rows(0, self.cells.shape[0])
+        flat &= np.uint8(0xFF ^ TileBits.COUNT)
+        flat |= counts
+
+    def count_rows(self, top: int, bottom: int):
+        """Writes the neighbor counts of rows [top, bottom), reading one row of halo each side."""
+        height = self.cells.shape[0]
+        lo, hi = max(top - 1, 0), min(bottom + 1, height)
+        mines = (self.cells[lo:hi] & TileBits.MINE) >> 4
+        padded = np.pad(mines, ((int(lo == top), int(hi == bottom)), (1, 1)))
+        rows = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+        counts = rows[:-2] + rows[1:-1] + rows[2:]
+        band_mines = mines[top - lo:bottom - lo]
+        counts -= band_mines
+        counts[band_mines != 0] = 0
+
+        self.detach_rows(top, bottom)
+        band = self.cells[top:bottom]
+        band &= np.uint8(0xFF ^ TileBits.COUNT)
+        band |= counts
+
+    def label_openings(self):
+        """Labels every opening (connected region of zero tiles) and its border.
+
+        Must run after calculate_neighbor_mines.
+        """
+        zero = (self.cells & (TileBits.MINE | TileBits.COUNT)) == 0
+        if self.geometry.square:
+            zero_cells, zero_owners, num_openings, labels, border_keys = self.label_zero_runs(zero)
+        else:
+            zero_cells, zero_owners, num_openings, labels, border_keys = self.label_zero_tiles(zero)
+        border_keys = np.sort(border_keys)
+        border_keys = border_keys[np.diff(border_keys, prepend=-1) != 0]
+        border_cells = border_keys % labels.size
+        border_owners = border_keys // labels.size
+
+        # Lay out each opening as its zero tiles followed by its border.
+        zero_counts = np.bincount(zero_owners, minlength=num_openings + 1)
+        border_counts = np.bincount(border_owners, minlength=num_openings + 1)
+        offsets = np.zeros(num_openings + 1, dtype=np.int64)
+        np.cumsum((zero_counts + border_counts)[1:], out=offsets[1:])
+        zero_starts = np.cumsum(zero_counts) - zero_counts
+        border_starts = np.cumsum(border_counts) - border_counts
+
+        members = np.empty(offsets[-1], dtype=np.int64)
+        members[offsets[zero_owners - 1] + np.arange(len(zero_cells)) -
+                zero_starts[zero_owners]] = zero_cells
+        members[offsets[border_owners - 1] + zero_counts[border_owners] +
+                np.arange(len(border_cells)) - border_starts[border_owners]] = border_cells
+
+        self.opening_labels = labels
+        self.opening_cells = members
+        self.opening_offsets = offsets
+
+    @staticmethod
+    def union_labels(num_nodes: int, upper: np.ndarray, lower: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Returns a 0-based component label per node and the component count."""
+        parent = np.arange(num_nodes)
+        while True:
+            root_upper, root_lower = parent[upper], parent[lower]
+            if np.array_equal(root_upper, root_lower):
+                break
+            low = np.minimum(root_upper, root_lower)
+            np.minimum.at(parent, root_upper, low)
+            np.minimum.at(parent, root_lower, low)
+            while True:
+                compressed = parent[parent]
+                if np.array_equal(compressed, parent):
+                    break
+                parent = compressed
+        is_root = parent == np.arange(num_nodes)
+        return (np.cumsum(is_root) - 1)[parent], int(is_root.sum())
+
+    def label_zero_runs(self, zero: np.ndarray):
+        """Labels square-grid openings by merging horizontal runs of zero tiles.
+
+        Border keys are owner * tiles + cell and may repeat.
+        """
+        height, width = zero.shape
+
+        # Horizontal runs of zero tiles as [start, stop) per row.
+        edges = np.diff(np.pad(zero, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+        run_rows, run_starts = np.nonzero(edges == 1)
+        run_stops = np.nonzero(edges == -1)[1]
+        num_runs = len(run_rows)
+
+        # A run in row y touches every run in row y + 1 that starts at or
+        # before its stop and stops at or after its start. Runs are sorted
+        # by (row, start), so both bounds come from binary searches.
+        stride = width + 2
+        start_keys = run_rows * stride + run_starts
+        stop_keys = run_rows * stride + run_stops
+        first = np.searchsorted(stop_keys, (run_rows + 1) * stride + run_starts)
+        last = np.searchsorted(start_keys, (run_rows + 1) * stride + run_stops, side='right')
+        degree = np.maximum(last - first, 0)
+        upper = np.repeat(np.arange(num_runs), degree)
+        lower = (np.repeat(first - np.cumsum(degree) + degree, degree) +
+                 np.arange(int(degree.sum())))
+        run_labels, num_openings = self.union_labels(num_runs, upper, lower)
+
+        # Paint labels onto the plane run by run, visiting runs grouped by
+        # opening so zero_cells comes out already grouped too.
+        order = np.argsort(run_labels, kind='stable')
+        lengths = (run_stops - run_starts)[order]
+        run_first_cell = (run_rows * width + run_starts)[order]
+        zero_cells = (np.repeat(run_first_cell - np.cumsum(lengths) + lengths, lengths) +
+                      np.arange(int(lengths.sum())))
+        zero_owners = np.repeat(run_labels[order] + 1, lengths)
+        labels = np.zeros(height * width, dtype=np.int32)
+        labels[zero_cells] = zero_owners
+        labels = labels.reshape(height, width)
+
+        # Border tiles are the numbered tiles touching an opening; one tile
+        # can touch several openings, and the same one more than once.
+        padded = np.pad(labels, 1)
+        border_keys = []
+        for dy in range(3):
+            for dx in range(3):
+                if dy == 1 and dx == 1:
+                    continue
+                neighbor = padded[dy:dy + height, dx:dx + width]
+                border = np.flatnonzero((neighbor > 0) & (labels == 0))
+                border_keys.append(neighbor.reshape(-1)[border].astype(np.int64) *
+                                   labels.size + border)
+        return zero_cells, zero_owners, num_openings, labels, np.concatenate(border_keys)
+
+    def label_zero_tiles(self, zero: np.ndarray):
+        """Labels openings on any topology through the neighbor table, like label_zero_runs."""
+        table = self.geometry.neighbor_table
+        flat_zero = np.append(zero.reshape(-1), False)  # padding is never zero
+        zero_tiles = np.flatnonzero(flat_zero)
+        neighbors = table[:, zero_tiles]
+
+        # Edges between zero tiles, in the compacted numbering of zero_tiles.
+        compact = np.full(len(flat_zero), -1, dtype=np.int64)
+        compact[zero_tiles] = np.arange(len(zero_tiles))
+        joined = flat_zero[neighbors]
+        sources = np.broadcast_to(np.arange(len(zero_tiles)), neighbors.shape)
+        upper = sources[joined]
+        lower = compact[neighbors[joined]]
+        tile_labels, num_openings = self.union_labels(len(zero_tiles), upper, lower)
+
+        order = np.argsort(tile_labels, kind='stable')
+        zero_cells = zero_tiles[order].astype(np.int64)
+        zero_owners = tile_labels[order] + 1
+        labels = np.zeros(zero.size, dtype=np.int32)
+        labels[zero_cells] = zero_owners
+
+        # Numbered neighbors of zero tiles form the border.
+        edge = (neighbors < zero.size) & ~joined
+        owners = np.broadcast_to(tile_labels + 1, neighbors.shape)[edge]
+        border_keys = owners.astype(np.int64) * zero.size + neighbors[edge]
+        return zero_cells, zero_owners, num_openings, labels.reshape(zero.shape), border_keys
+
+    @property
+    def num_openings(self) -> int:
+        """Number of openings found by label_openings."""
+        if self.opening_offsets is None:
+            return 0
+        return len(self.opening_offsets) - 1
+
+    def reveal_tile(self, x: int, y: int) -> BoardDelta:
+        """Reveals a tile and iteratively reveals neighbors if it's empty."""
+        if not (0 <= x < self.config.grid_width and
+                0 <= y < self.config.grid_height):
+            return BoardDelta()
+        return self.publish(self.make_delta(self.open_tile(x, y)))
+
+    def reveal_many(self, cells) -> BoardDelta:
+        """Reveals every listed tile, cascading as usual, as one published delta.
+
+        cells is a sequence of (x, y) pairs or an (n, 2) array.
+        """
+        indices = self.cell_indices(cells)
+        flat = self.cells.reshape(-1)
+        states = flat[indices]
+        indices = indices[(states & (TileBits.REVEALED | TileBits.FLAGGED)) == 0]
+        states = flat[indices]
+        direct = (states & (TileBits.MINE | TileBits.COUNT)) != 0
+
+        changed = [indices[direct]]
+        self.detach_indices(changed[0])
+        flat[changed[0]] |= TileBits.REVEALED
+        self.safe_tiles_left -= int(np.count_nonzero((states[direct] & TileBits.MINE) == 0))
+        for index in indices[~direct]:
+            y, x = divmod(int(index), self.config.grid_width)
+            changed.append(self.open_tile(x, y))
+        return self.publish(self.make_delta(np.concatenate(changed)))
+
+    def cell_indices(self, cells) -> np.ndarray:
+        """Returns the sorted, distinct flat indices of the on-board (x, y) cells."""
+        coords = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        xs, ys = coords[:, 0], coords[:, 1]
+        width, height = self.config.grid_width, self.config.grid_height
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        return np.unique(ys[inside] * width + xs[inside])
+
+    def open_tile(self, x: int, y: int) -> np.ndarray:
+        """Reveals a tile and its cascade without publishing; returns the flat indices revealed."""
+        tile = self.cells[y, x]
+        if tile & (TileBits.REVEALED | TileBits.FLAGGED):
+            return np.zeros(0, dtype=np.int64)
+
+        if tile & (TileBits.MINE | TileBits.COUNT):
+            self.detach_rows(y, y + 1)
+            self.cells[y, x] = tile | TileBits.REVEALED
+            if not tile & TileBits.MINE:
+                self.safe_tiles_left -= 1
+            return np.array([y * self.config.grid_width + x])
+
+        if self.opening_labels is not None:
+            changed = self.reveal_opening(int(self.opening_labels[y, x]))
+            if changed is not None:
+                return changed
+        if not self.geometry.square:
+            return self.flood_fill_table(y * self.config.grid_width + x)
+        return self.flood_fill(x, y)
+
+    def chord(self, x: int, y: int) -> BoardDelta:
+        """Reveals the hidden neighbors of a number whose flags are all placed, as one delta."""
+        if not (0 <= x < self.config.grid_width and
+                0 <= y < self.config.grid_height):
+            return BoardDelta()
+
+        tile = self.cells[y, x]
+        count = tile & TileBits.COUNT
+        if not tile & TileBits.REVEALED or tile & TileBits.MINE or not count:
+            return BoardDelta()
+
+        neighbors = self.geometry.neighbors(y * self.config.grid_width + x)
+        states = self.cells.reshape(-1)[neighbors]
+        if np.count_nonzero(states & TileBits.FLAGGED) != count:
+            return BoardDelta()
+
+        changed = []
+        for index in neighbors[(states & (TileBits.REVEALED | TileBits.FLAGGED)) == 0]:
+            ny, nx = divmod(int(index), self.config.grid_width)
+            changed.append(self.open_tile(nx, ny))
+        if not changed:
+            return BoardDelta()
+        return self.publish(self.make_delta(np.concatenate(changed)))
+
+    def reveal_opening(self, label: int) -> Optional[np.ndarray]:
+        """Reveals a whole opening and its border; returns the flat indices revealed.
+
+        Returns None, changing nothing, if the opening is partly open or flagged.
+        """
+        start, stop = self.opening_offsets[label - 1], self.opening_offsets[label]
+        members = self.opening_cells[start:stop]
+        flat = self.cells.reshape(-1)
+        states = flat[members]
+        opened = (states & (TileBits.REVEALED | TileBits.MINE | TileBits.COUNT)) == TileBits.REVEALED
+        if (states & TileBits.FLAGGED).any() or opened.any():
+            return None
+
+        hidden = members[(states & TileBits.REVEALED) == 0]
+        self.detach_indices(hidden)
+        flat[hidden] |= TileBits.REVEALED
+        self.safe_tiles_left -= len(hidden)
+        return hidden
+
+    def flood_fill(self, x: int, y: int) -> np.ndarray:
+        """Reveals the cascade from a hidden zero tile, one row at a time.
+
+        Returns the flat indices it revealed.
+        """
+        cells = self.cells
+        height, width = cells.shape
+        hidden_bits = TileBits.REVEALED | TileBits.FLAGGED
+        empty_bits = TileBits.MINE | TileBits.COUNT
+        pending: Dict[int, List[np.ndarray]] = {y: [np.array([x])]}
+        rows = [y]
+        changed = []
+
+        while rows:
+            y = rows.pop()
+            seeds = np.concatenate(pending.pop(y))
+            row = cells[y]
+            cascading = (row & (hidden_bits | empty_bits)) == 0
+            seeds = seeds[cascading[seeds]]
+            if not len(seeds):
+                continue
+
+            # Runs of cascading tiles that contain at least one seed.
+            run_ids = np.cumsum(cascading & ~np.r_[False, cascading[:-1]])
+            chosen = np.zeros(run_ids[-1] + 1, dtype=bool)
+            chosen[run_ids[seeds]] = True
+            fill = cascading & chosen[run_ids]
+            self.detach_rows(max(y - 1, 0), min(y + 2, height))
+            row[fill] |= TileBits.REVEALED
+            revealed = int(np.count_nonzero(fill))
+            changed.append(np.flatnonzero(fill) + y * width)
+
+            near = fill.copy()
+            near[1:] |= fill[:-1]
+            near[:-1] |= fill[1:]
+            for ny in range(max(y - 1, 0), min(y + 2, height)):
+                neighbor_row = cells[ny]
+                hidden = near & ((neighbor_row & hidden_bits) == 0)
+                empty = hidden & ((neighbor_row & empty_bits) == 0)
+                numbered = hidden & ~empty
+                neighbor_row[numbered] |= TileBits.REVEALED
+                revealed += int(np.count_nonzero(numbered))
+                changed.append(np.flatnonzero(numbered) + ny * width)
+                if ny != y and empty.any():
+                    run_starts = np.flatnonzero(empty & ~np.r_[False, empty[:-1]])
+                    if ny not in pending:
+                        pending[ny] = []
+                        rows.append(ny)
+                    pending[ny].append(run_starts)
+
+            self.safe_tiles_left -= revealed
+
+        return np.concatenate(changed) if changed else np.zeros(0, dtype=np.int64)
+
+    def flood_fill_table(self, start: int) -> np.ndarray:
+        """Reveals the cascade from a hidden zero tile in waves through the neighbor table.
+
+        Returns the flat indices it revealed.
+        """
+        flat = self.cells.reshape(-1)
+        table = self.geometry.neighbor_table
+        hidden_bits = TileBits.REVEALED | TileBits.FLAGGED
+        empty_bits = TileBits.MINE | TileBits.COUNT
+
+        wave = np.array([start], dtype=np.int64)
+        changed = []
+        while len(wave):
+            self.detach_indices(wave)
+            flat[wave] |= TileBits.REVEALED
+            changed.append(wave)
+            zero = wave[(flat[wave] & empty_bits) == 0]
+            candidates = table[:, zero].ravel()
+            candidates = candidates[candidates < flat.size]  # drop padding
+            candidates = candidates[(flat[candidates] & hidden_bits) == 0]
+            wave = np.unique(candidates).astype(np.int64)
+        revealed = np.concatenate(changed)
+        self.safe_tiles_left -= len(revealed)
+        return revealed
+
+    def reveal_all_mines(self) -> BoardDelta:
+        """Reveals all mines on the board."""
+        flat = self.cells.reshape(-1)
+        hidden_mines = np.flatnonzero((flat & (TileBits.MINE | TileBits.REVEALED)) == TileBits.MINE)
+        self.detach_indices(hidden_mines)
+        flat[hidden_mines] |= TileBits.REVEALED
+        return self.publish(self.make_delta(hidden_mines))
+
+    def toggle_flag(self, x: int, y: int) -> BoardDelta:
+        """Toggles flag on a tile. Returns the change, empty if nothing happened."""
+        if (0 <= x < self.config.grid_width and
+            0 <= y < self.config.grid_height):
+            if not self.cells[y, x] & TileBits.REVEALED:
+                self.detach_rows(y, y + 1)
+                self.cells[y, x] ^= TileBits.FLAGGED
+                self.flags_placed += 1 if self.cells[y, x] & TileBits.FLAGGED else -1
+                return self.publish(self.make_delta(np.array([y * self.config.grid_width + x])))
+        return BoardDelta()
+
+    def flag_many(self, cells, flagged: bool = True) -> BoardDelta:
+        """Sets or clears the flag on every listed hidden tile as one published delta.
+
+        Unlike toggle_flag this is idempotent: tiles off the board, revealed
+        or already in the requested state are skipped.
+        """
+        indices = self.cell_indices(cells)
+        flat = self.cells.reshape(-1)
+        states = flat[indices]
+        wanted = TileBits.FLAGGED if flagged else 0
+        indices = indices[((states & TileBits.REVEALED) == 0) &
+                          ((states & TileBits.FLAGGED) != wanted)]
+        self.detach_indices(indices)
+        flat[indices] ^= TileBits.FLAGGED
+        self.flags_placed += len(indices) if flagged else -len(indices)
+        return self.publish(self.make_delta(indices))
+
+    def read_chunk(self, chunk: int) -> np.ndarray:
+        """Returns the rows of one BoardSnapshot chunk as a view."""
+        rows = BoardSnapshot.CHUNK_ROWS
+        return self.cells[chunk * rows:(chunk + 1) * rows]
+
+    def apply_states(self, delta: BoardDelta) -> BoardDelta:
+        """Sets the REVEALED and FLAGGED bits of tiles to the visible states in delta.
+
+        Used to undo and redo moves; mines and counts are left alone. The
+        change is published like any other mutation.
+        """
+        indices = np.frombuffer(delta.indices, dtype=np.int64)
+        states = np.frombuffer(delta.states, dtype=np.uint8)
+        player_bits = np.uint8(TileBits.REVEALED | TileBits.FLAGGED)
+        flat = self.cells.reshape(-1)
+        old = flat[indices]
+        new = (old & ~player_bits) | (states & player_bits)
+        previous = np.where(old & TileBits.REVEALED, old, old & TileBits.FLAGGED)
+
+        safe = (old & TileBits.MINE) == 0
+        was_revealed = (old & TileBits.REVEALED) != 0
+        is_revealed = (new & TileBits.REVEALED) != 0
+        self.safe_tiles_left -= int(np.count_nonzero(safe & is_revealed & ~was_revealed))
+        self.safe_tiles_left += int(np.count_nonzero(safe & was_revealed & ~is_revealed))
+        self.flags_placed += int(np.count_nonzero(new & TileBits.FLAGGED))
+        self.flags_placed -= int(np.count_nonzero(old & TileBits.FLAGGED))
+        self.detach_indices(indices)
+        flat[indices] = new
+        return self.publish(self.make_delta(indices), previous.astype(np.uint8).tobytes())
+
+    def make_delta(self, indices: np.ndarray) -> BoardDelta:
+        """Builds a BoardDelta from the current state of the given flat tiles."""
+        states = self.cells.reshape(-1)[indices]
+        visible = np.where(states & TileBits.REVEALED, states, states & TileBits.FLAGGED)
+        return BoardDelta(array('q', indices.astype(np.int64).tobytes()),
+                          visible.astype(np.uint8).tobytes())
+
+    def full_delta(self) -> BoardDelta:
+        """Returns an unpublished delta of every tile in its current visible state."""
+        return self.make_delta(np.arange(self.cells.size))
+
+    def check_victory(self) -> bool:
+        """Checks if all non-mine tiles have been revealed."""
+        if self.config.debug_checks:
+            self.verify_counters()
+        return self.safe_tiles_left == 0
+
+    def count_flags(self) -> int:
+        """Counts the number of flags placed on the board."""
+        if self.config.debug_checks:
+            self.verify_counters()
+        return self.flags_placed
+
+    def verify_counters(self):
+        """Cross-checks the running counters against a full board scan."""
+        safe_tiles_left = int(np.count_nonzero(
+            (self.cells & (TileBits.MINE | TileBits.REVEALED)) == 0
+        ))
+        flags_placed = int(np.count_nonzero(self.cells & TileBits.FLAGGED))
+        if (safe_tiles_left, flags_placed) != (self.safe_tiles_left, self.flags_placed):
+            raise RuntimeError(
+                f"Board counters out of sync: safe_tiles_left={self.safe_tiles_left} "
+                f"(scan {safe_tiles_left}), flags_placed={self.flags_placed} "
+                f"(scan {flags_placed})"
+            )
+        indices = np.arange(self.cells.size, dtype=np.int64)
+        zobrist = zobrist_hash(array('q', indices.tobytes()), self.make_delta(indices).states)
+        if zobrist != self.zobrist:
+            raise RuntimeError(f"Board hash out of sync: zobrist={self.zobrist:#x} (scan {zobrist:#x})")
+
+    def tile_state(self, x: int, y: int) -> int:
+        """Returns the packed TileBits value of a tile."""
+        return int(self.cells[y, x])
+
+    def is_mine(self, x: int, y: int) -> bool:
+        """Returns True if the tile holds a mine."""
+        return bool(self.cells[y, x] & TileBits.MINE)
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        """Returns True if the tile has been revealed."""
+        return bool(self.cells[y, x] & TileBits.REVEALED)
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        """Returns True if the tile carries a flag."""
+        return bool(self.cells[y, x] & TileBits.FLAGGED)
@@ -0,0 +1,85 @@
+"""Game configuration and the packed tile layout."""
+from __future__ import annotations
+
+from enum import Enum
+from importlib.util import find_spec
+from typing import Dict, Optional
+
+
+class Difficulty(Enum):
+    EASY = "Easy"
+    NORMAL = "Normal"
+    HARD = "Hard"
+    CUSTOM = "Custom"
+
+
+class TileBits:
+    """Bit layout of one packed board cell (uint8)."""
+    COUNT = 0x0F  # neighbor_mines, 0-8
+    MINE = 0x10
+    REVEALED = 0x20
+    FLAGGED = 0x40
+
+
+class GameConfig:
+    DIFFICULTY_SETTINGS = {
+        Difficulty.EASY: {"size": (12, 9), "mines": 10},
+        Difficulty.NORMAL: {"size": (18, 14), "mines": 40},
+        Difficulty.HARD: {"size": (32, 18), "mines": 99}
+    }
+
+    # Tiles within this Chebyshev distance of the first click never hold a
+    # mine (1 = the 3x3 block around it, 0 = only the clicked tile).
+    SAFE_ZONE_RADIUS = 1
+
+    # When enabled, Board cross-checks its incremental counters against a
+    # full scan on every query. Meant for development only.
+    DEBUG_CHECKS = False
+
+    # Practice mode keeps a move journal so moves can be undone and redone.
+    PRACTICE = False
+
+    # Board implementation, one of BOARD_BACKENDS. Probed without importing
+    # NumPy so that loading the configuration stays cheap.
+    DEFAULT_BACKEND = "numpy" if find_spec("numpy") is not None else "bitboard"
+
+    # Neighbor rule, see parse_topology. Only the numpy backend supports
+    # anything but "square".
+    TOPOLOGY = "square"
+
+    def __init__(self, difficulty: Difficulty, custom_settings: Optional[Dict] = None):
+        self.difficulty = difficulty
+        self.custom_settings = custom_settings
+        self.safe_zone_radius = self.SAFE_ZONE_RADIUS
+        self.debug_checks = self.DEBUG_CHECKS
+        self.practice = self.PRACTICE
+        self.backend = self.DEFAULT_BACKEND
+        self.topology = self.TOPOLOGY
+        # With a seed, the mine layout is fully determined by the seed, the
+        # board size, the mine count and the first click (see seeded_mines).
+        self.seed: Optional[int] = None
+        self.update_settings()
+
+    @classmethod
+    def custom(cls, width: int, height: int, num_mines: int) -> 'GameConfig':
+        """Creates a configuration for a custom board size."""
+        if width < 1 or height < 1:
+            raise ValueError(f"Invalid board size: {width}x{height}")
+        if not 0 <= num_mines < width * height:
+            raise ValueError(
+                f"A {width}x{height} board holds at most {width * height - 1} mines, "
+                f"got {num_mines}"
+            )
+        return cls(Difficulty.CUSTOM, {"size": (width, height), "mines": num_mines})
+
+    def update_settings(self):
+        if self.difficulty == Difficulty.CUSTOM:
+            settings = self.custom_settings
+        else:
+            settings = self.DIFFICULTY_SETTINGS[self.difficulty]
+        self.grid_width, self.grid_height = settings["size"]
+        self.num_mines = settings["mines"]
+
+    def set_difficulty(self, difficulty: Difficulty):
+        self.difficulty = difficulty
+        self.update_settings()
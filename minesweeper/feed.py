@@ -0,0 +1,148 @@
+"""Board deltas, the change feed and Zobrist hashing of visible state."""
+from __future__ import annotations
+
+import functools
+import operator
+from abc import ABC, abstractmethod
+from array import array
+from typing import Callable, Iterator, Tuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Only the "bitboard" backend is available without NumPy.
+    np = None
+
+from .config import TileBits
+from .seeding import MASK64, cell_key, cell_keys
+
+
+# Maps a player-visible state after a move to the state before it. Moves
+# only reveal hidden tiles (which could not carry a flag unless revealed
+# by reveal_all_mines) or toggle a flag.
+UNDO_STATES = bytes(state & TileBits.FLAGGED if state & TileBits.REVEALED
+                     else state ^ TileBits.FLAGGED for state in range(256))
+
+# Visible states that do not show a mine, deleted by BoardDelta.has_mine.
+SAFE_STATES = bytes(state for state in range(256) if not state & TileBits.MINE)
+
+ZOBRIST_BASE = 0x5A0B8157A11CE5ED
+
+
+def zobrist_hash(indices: array, states: bytes) -> int:
+    """XORs the Zobrist keys of tiles in the given visible states.
+
+    A tile's key is cell_key(ZOBRIST_BASE, index << 8 | state), so no key
+    table is stored; hidden, unflagged tiles (state 0) contribute nothing.
+    Over all tiles this is the hash of the visible board.
+    """
+    if np is None:
+        return functools.reduce(operator.xor, (
+            cell_key(ZOBRIST_BASE, (index << 8 | state) & MASK64)
+            for index, state in zip(indices, states) if state), 0)
+    visible = np.frombuffer(states, dtype=np.uint8)
+    chosen = visible != 0
+    if not chosen.any():
+        return 0
+    counters = (np.frombuffer(indices, dtype=np.int64)[chosen].astype(np.uint64) << np.uint64(8)) | \
+        visible[chosen].astype(np.uint64)
+    return int(np.bitwise_xor.reduce(cell_keys(ZOBRIST_BASE, counters)))
+
+
+class BoardDelta:
+    """Tiles changed by one board mutation.
+
+    indices holds flat tile indices (y * grid_width + x) and states the
+    player-visible TileBits of each tile after the change: revealed tiles
+    carry their full state, hidden tiles only their FLAGGED bit. An empty
+    delta is falsy, so callers can keep treating a mutation's result as
+    "did anything change".
+    """
+
+    __slots__ = ("indices", "states")
+
+    def __init__(self, indices: Optional[array] = None, states: bytes = b""):
+        self.indices = indices if indices is not None else array('q')
+        self.states = states
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.indices, self.states)
+
+    def has_mine(self) -> bool:
+        """Returns True if the change revealed a mine."""
+        return bool(self.states.translate(None, SAFE_STATES))
+
+    def __repr__(self) -> str:
+        return f"BoardDelta({len(self)} tiles)"
+
+
+class ChangeFeed:
+    """Subscriber list and visible-state hash shared by the board backends.
+
+    Every mutating Board method returns its BoardDelta and passes any
+    non-empty delta to each subscriber, in subscription order. Holders
+    keep `zobrist`, the Zobrist hash of the visible board, which publish
+    updates in O(1) per changed tile.
+    """
+
+    def subscribe(self, callback: Callable[[BoardDelta], None]):
+        """Registers a callback to receive every non-empty delta."""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[BoardDelta], None]):
+        """Removes a previously registered callback."""
+        self.subscribers.remove(callback)
+
+    def publish(self, delta: BoardDelta, previous: Optional[bytes] = None) -> BoardDelta:
+        """Folds a delta into `zobrist`, sends it to the subscribers and returns it.
+
+        previous holds the visible states before the change. It defaults to
+        inverting a forward move (a reveal or a flag toggle); apply_states,
+        which can go either way, passes it explicitly.
+        """
+        if delta:
+            if previous is None:
+                previous = delta.states.translate(UNDO_STATES)
+            self.zobrist ^= zobrist_hash(delta.indices, previous) ^ \
+                zobrist_hash(delta.indices, delta.states)
+            for callback in list(self.subscribers):
+                callback(delta)
+        return delta
+
+
+class FeedFollower(ABC):
+    """Structure kept current from a board's change feed.
+
+    It loads the board's full visible state, then folds in every published
+    delta through record. Board.reset publishes nothing, so sync compares
+    the board's `generation` and clears the follower when it moved.
+    Subclasses extend clear and implement load and record.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.load(board.full_delta())
+        board.subscribe(self.record)
+
+    def detach(self):
+        """Stops following the board."""
+        self.board.unsubscribe(self.record)
+
+    def clear(self):
+        """Forgets all state, matching a freshly reset board."""
+        self.generation = self.board.generation
+
+    def sync(self):
+        """Starts over after Board.reset, which publishes no delta."""
+        if self.board.generation != self.generation:
+            self.clear()
+
+    @abstractmethod
+    def load(self, delta: BoardDelta):
+        """Rebuilds from a delta covering every tile."""
+
+    @abstractmethod
+    def record(self, delta: BoardDelta):
+        """Change feed callback: folds one delta in."""
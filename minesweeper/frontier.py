@@ -0,0 +1,93 @@
+"""The frontier: hidden tiles next to revealed numbers, and those numbers."""
+from __future__ import annotations
+
+from typing import Set
+
+import numpy as np
+
+from .config import TileBits
+from .feed import BoardDelta, FeedFollower
+
+
+class Frontier(FeedFollower):
+    """Frontier of a board, kept current from its change feed.
+
+    `cells` holds the hidden, unflagged tiles adjacent to at least one
+    revealed number and `numbers` the revealed numbered tiles that still
+    have such a neighbor; both are sets of flat tile indices. Solvers,
+    hints and heatmaps iterate these instead of rescanning the board.
+
+    A delta only changes the membership of its own tiles and their
+    neighbors, so each one is settled with a couple of gathers through the
+    geometry's padded neighbor table. Only visible states are read.
+    """
+
+    def clear(self):
+        """Empties the frontier for a freshly reset board of the current size."""
+        super().clear()
+        self.geometry = self.board.geometry
+        num_cells = self.geometry.num_cells
+        # One extra slot for the table's padding sentinel, set to a revealed
+        # zero: neither hidden nor a number.
+        self.visible = np.zeros(num_cells + 1, dtype=np.uint8)
+        self.visible[num_cells] = TileBits.REVEALED
+        self.in_cells = np.zeros(num_cells, dtype=bool)
+        self.in_numbers = np.zeros(num_cells, dtype=bool)
+        self._cells: Set[int] = set()
+        self._numbers: Set[int] = set()
+
+    @property
+    def cells(self) -> Set[int]:
+        """Hidden, unflagged tiles next to a revealed number, current even after a reset."""
+        self.sync()
+        return self._cells
+
+    @property
+    def numbers(self) -> Set[int]:
+        """Revealed numbers with a hidden, unflagged neighbor, current even after a reset."""
+        self.sync()
+        return self._numbers
+
+    def load(self, delta: BoardDelta):
+        """Rebuilds the frontier from a delta covering every tile."""
+        self.clear()
+        self.visible[np.frombuffer(delta.indices, dtype=np.int64)] = \
+            np.frombuffer(delta.states, dtype=np.uint8)
+        self.refresh(np.arange(self.geometry.num_cells))
+
+    @staticmethod
+    def hidden(states: np.ndarray) -> np.ndarray:
+        """Tiles that are neither revealed nor flagged."""
+        return (states & (TileBits.REVEALED | TileBits.FLAGGED)) == 0
+
+    @staticmethod
+    def numbered(states: np.ndarray) -> np.ndarray:
+        """Revealed safe tiles with a nonzero count."""
+        return (((states & (TileBits.REVEALED | TileBits.MINE)) == TileBits.REVEALED) &
+                ((states & TileBits.COUNT) != 0))
+
+    def record(self, delta: BoardDelta):
+        """Change feed callback: settles the changed tiles and their neighbors."""
+        self.sync()
+        indices = np.frombuffer(delta.indices, dtype=np.int64)
+        self.visible[indices] = np.frombuffer(delta.states, dtype=np.uint8)
+        table = self.geometry.neighbor_table
+        touched = np.unique(np.concatenate((indices, table[:, indices].ravel())))
+        self.refresh(touched[touched < self.geometry.num_cells])
+
+    def refresh(self, tiles: np.ndarray):
+        """Recomputes the frontier membership of the given flat tiles."""
+        states = self.visible[tiles]
+        around = self.visible[self.geometry.neighbor_table[:, tiles]]
+        self.update(self._cells, self.in_cells, tiles,
+                    self.hidden(states) & self.numbered(around).any(axis=0))
+        self.update(self._numbers, self.in_numbers, tiles,
+                    self.numbered(states) & self.hidden(around).any(axis=0))
+
+    @staticmethod
+    def update(members: Set[int], plane: np.ndarray, tiles: np.ndarray, inside: np.ndarray):
+        """Brings one membership set and its plane in line with inside."""
+        was = plane[tiles]
+        members.update(tiles[inside & ~was].tolist())
+        members.difference_update(tiles[was & ~inside].tolist())
+        plane[tiles] = inside
@@ -0,0 +1,262 @@
+"""Neighbor rules (topologies) and the cached per-size geometry tables."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterator, Tuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Only the "bitboard" backend is available without NumPy.
+    np = None
+
+from .config import GameConfig
+
+
+class Topology(ABC):
+    """Neighbor rule of a board shape.
+
+    Subclasses describe each neighbor slot k as vectorized coordinates
+    (nx, ny, valid) for all tiles at once. neighbor_table turns them into
+    the padded table every non-square kernel gathers through, so kernels
+    never branch per neighbor.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def neighbor_slots(self, xs: np.ndarray, ys: np.ndarray, width: int,
+                       height: int) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Yields (nx, ny, valid) for each neighbor slot of the tiles at (xs, ys)."""
+
+    def neighbor_table(self, width: int, height: int) -> np.ndarray:
+        """Returns an int32 (max_degree, tiles) table of flat neighbor indices.
+
+        Row k holds every tile's k-th neighbor, so a gather streams one
+        contiguous row per slot. Missing neighbors hold the sentinel
+        width * height; kernels append one zero slot to the gathered plane
+        so it reads as "no mine".
+        """
+        num_cells = width * height
+        ys, xs = np.divmod(np.arange(num_cells, dtype=np.int64), width)
+        slots = list(self.neighbor_slots(xs, ys, width, height))
+        table = np.empty((len(slots), num_cells), dtype=np.int32)
+        for k, (nx, ny, valid) in enumerate(slots):
+            table[k] = np.where(valid, ny * width + nx, num_cells)
+        return table
+
+
+class SquareTopology(Topology):
+    """The classic 8-neighborhood with clipped edges."""
+
+    name = "square"
+
+    def neighbor_slots(self, xs, ys, width, height):
+        for dx, dy in BoardGeometry.NEIGHBOR_DELTAS:
+            nx, ny = xs + dx, ys + dy
+            yield nx, ny, (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+
+
+class TorusTopology(Topology):
+    """8-neighborhood wrapping around both edges."""
+
+    name = "torus"
+
+    def neighbor_slots(self, xs, ys, width, height):
+        if width < 3 or height < 3:
+            raise ValueError("A torus needs at least 3 tiles in each direction")
+        for dx, dy in BoardGeometry.NEIGHBOR_DELTAS:
+            yield (xs + dx) % width, (ys + dy) % height, np.ones(xs.shape, dtype=bool)
+
+
+class HexTopology(Topology):
+    """Pointy-top hexagons in "odd-r" layout: odd rows are shifted half a tile right."""
+
+    name = "hex"
+    EVEN_ROW_DELTAS = [(-1, -1), (0, -1), (-1, 0), (1, 0), (-1, 1), (0, 1)]
+    ODD_ROW_DELTAS = [(0, -1), (1, -1), (-1, 0), (1, 0), (0, 1), (1, 1)]
+
+    def neighbor_slots(self, xs, ys, width, height):
+        odd = (ys & 1).astype(bool)
+        for (even_dx, dy), (odd_dx, _) in zip(self.EVEN_ROW_DELTAS, self.ODD_ROW_DELTAS):
+            nx, ny = xs + np.where(odd, odd_dx, even_dx), ys + dy
+            yield nx, ny, (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+
+
+class CubeTopology(Topology):
+    """3D grid with 26 neighbors, stored as `layers` slices stacked along the rows.
+
+    Layer z occupies rows [z * height / layers, (z + 1) * height / layers).
+    """
+
+    name = "cube"
+
+    def __init__(self, layers: int):
+        if layers < 1:
+            raise ValueError("A cube needs at least one layer")
+        self.layers = layers
+
+    def neighbor_slots(self, xs, ys, width, height):
+        if height % self.layers:
+            raise ValueError(f"Height {height} is not a multiple of {self.layers} layers")
+        layer_height = height // self.layers
+        zs, rows = np.divmod(ys, layer_height)
+        for dz in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if not (dx or dy or dz):
+                        continue
+                    nx, nrow, nz = xs + dx, rows + dy, zs + dz
+                    valid = ((nx >= 0) & (nx < width) & (nrow >= 0) & (nrow < layer_height) &
+                             (nz >= 0) & (nz < self.layers))
+                    yield nx, nz * layer_height + nrow, valid
+
+
+def parse_topology(name: str) -> Topology:
+    """Returns the Topology for "square", "torus", "hex" or "cube:<layers>"."""
+    kind, _, argument = name.partition(":")
+    if kind == "cube" and argument.isdigit():
+        return CubeTopology(int(argument))
+    simple = {"square": SquareTopology, "torus": TorusTopology, "hex": HexTopology}
+    if kind in simple and not argument:
+        return simple[kind]()
+    raise ValueError(f"Unknown topology: {name}")
+
+
+class BoardGeometry:
+    """Shape-derived tables shared by every board of one size and topology.
+
+    neighbor_offsets and neighbor_indices form a CSR adjacency list: the
+    neighbors of flat tile i are
+    neighbor_indices[neighbor_offsets[i]:neighbor_offsets[i + 1]].
+    neighbor_table is the same adjacency padded to a fixed degree (see
+    Topology.neighbor_table). Tables are built on first use, so a board
+    that never asks for them (e.g. a huge custom board) costs nothing extra.
+    """
+
+    NEIGHBOR_DELTAS = [(-1, -1), (0, -1), (1, -1),
+                       (-1, 0), (1, 0),
+                       (-1, 1), (0, 1), (1, 1)]
+
+    def __init__(self, width: int, height: int, topology: str = "square"):
+        self.rule = parse_topology(topology)
+        self.width = width
+        self.height = height
+        self.topology = topology
+        self.num_cells = width * height
+        self._neighbor_table = None
+        self._neighbor_offsets = None
+        self._neighbor_indices = None
+        self._bit_mask: Optional[int] = None
+
+    @property
+    def square(self) -> bool:
+        """True for the classic grid, which the specialised kernels assume."""
+        return self.topology == "square"
+
+    @property
+    def neighbor_table(self) -> np.ndarray:
+        """Padded (max_degree, tiles) neighbor table; missing slots hold num_cells."""
+        if self._neighbor_table is None:
+            self._neighbor_table = self.rule.neighbor_table(self.width, self.height)
+        return self._neighbor_table
+
+    @property
+    def neighbor_offsets(self):
+        """CSR row pointers: one entry per tile plus a final end offset."""
+        if self._neighbor_offsets is None:
+            self._build_adjacency()
+        return self._neighbor_offsets
+
+    @property
+    def neighbor_indices(self):
+        """Flat indices of every tile's neighbors, grouped by tile."""
+        if self._neighbor_indices is None:
+            self._build_adjacency()
+        return self._neighbor_indices
+
+    def neighbors(self, index: int):
+        """Returns the flat indices of the tiles adjacent to flat tile index.
+
+        On the square grid they are computed directly, without the tables.
+        """
+        if self.square:
+            width, height = self.width, self.height
+            y, x = divmod(index, width)
+            adjacent = [(y + dy) * width + x + dx for dx, dy in self.NEIGHBOR_DELTAS
+                        if 0 <= x + dx < width and 0 <= y + dy < height]
+            return np.array(adjacent, dtype=np.int64) if np is not None else adjacent
+        offsets = self.neighbor_offsets
+        return self.neighbor_indices[offsets[index]:offsets[index + 1]]
+
+    def _build_adjacency(self):
+        """Builds the CSR tables, with NumPy when available (required off the square grid)."""
+        width, height = self.width, self.height
+        if np is not None:
+            table = self.neighbor_table.T
+            valid = table < self.num_cells
+            offsets = np.zeros(self.num_cells + 1, dtype=np.int64)
+            np.cumsum(valid.sum(axis=1), out=offsets[1:])
+            self._neighbor_offsets, self._neighbor_indices = offsets, table[valid]
+            return
+        if not self.square:
+            raise RuntimeError(f"The {self.topology} topology requires NumPy")
+
+        offsets, indices = array('q', [0]), array('l')
+        for y in range(height):
+            for x in range(width):
+                for dx, dy in self.NEIGHBOR_DELTAS:
+                    if 0 <= x + dx < width and 0 <= y + dy < height:
+                        indices.append((y + dy) * width + x + dx)
+                offsets.append(len(indices))
+        self._neighbor_offsets, self._neighbor_indices = offsets, indices
+
+    @property
+    def bit_mask(self) -> int:
+        """All in-board bits of a BitBoard plane (row stride width + 1)."""
+        if self._bit_mask is None:
+            row_mask = (1 << self.width) - 1
+            stride = self.width + 1
+            mask = 0
+            for y in range(self.height):
+                mask |= row_mask << (y * stride)
+            self._bit_mask = mask
+        return self._bit_mask
+
+
+class GeometryCache:
+    """LRU cache of BoardGeometry keyed by (width, height, topology).
+
+    Geometries for the preset difficulty sizes stay cached for the whole
+    session; custom sizes are evicted least recently used once more than
+    `capacity` of them are held.
+    """
+
+    def __init__(self, capacity: int = 8):
+        self.capacity = capacity
+        self._presets: Dict[Tuple[int, int, str], BoardGeometry] = {}
+        self._custom: OrderedDict[Tuple[int, int, str], BoardGeometry] = OrderedDict()
+
+    def get(self, width: int, height: int, topology: str = "square") -> BoardGeometry:
+        """Returns the cached geometry for a board shape, creating it if needed."""
+        key = (width, height, topology)
+        geometry = self._presets.get(key)
+        if geometry is not None:
+            return geometry
+        if key in self._custom:
+            self._custom.move_to_end(key)
+            return self._custom[key]
+
+        geometry = BoardGeometry(width, height, topology)
+        preset_sizes = [settings["size"] for settings in GameConfig.DIFFICULTY_SETTINGS.values()]
+        if (width, height) in preset_sizes:
+            self._presets[key] = geometry
+        else:
+            self._custom[key] = geometry
+            while len(self._custom) > self.capacity:
+                self._custom.popitem(last=False)
+        return geometry
+
+
+GEOMETRY_CACHE = GeometryCache()
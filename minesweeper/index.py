@@ -0,0 +1,163 @@
+"""Rectangle counts of revealed tiles, flags and known mines."""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from .config import TileBits
+from .feed import BoardDelta, FeedFollower
+
+
+class RectIndex(FeedFollower):
+    """2D Fenwick trees over a board's visible state, fed by its change feed.
+
+    Answers "how many revealed tiles, flags and known (revealed) mines lie
+    in this rectangle" in O(log width * log height) per query, for the
+    minimap, chunk-completion checks and HUD. Rectangles are half-open,
+    [x0, x1) x [y0, y1), and clipped to the board.
+
+    Each delta is folded in as one batch: the trees of the changed tiles
+    are updated together with np.add.at, and a delta large enough to touch
+    most nodes anyway (a big cascade, reveal_all_mines, an undo) rebuilds
+    all three trees in linear time instead. Only visible states are
+    indexed, so the index never leaks hidden mines.
+    """
+
+    PLANES = ("revealed", "flagged", "mines")
+
+    def clear(self):
+        """Empties the index for a freshly reset board of the current size."""
+        super().clear()
+        width, height = self.board.config.grid_width, self.board.config.grid_height
+        self.width, self.height = width, height
+        self.visible = np.zeros(width * height, dtype=np.uint8)
+        # tree[plane, i, j] covers rows (i - lowbit(i), i] and columns
+        # (j - lowbit(j), j], 1-based. Row and column 0 stay zero so that
+        # finished query chains can be padded with index 0.
+        self.tree = np.zeros((len(self.PLANES), height + 1, width + 1), dtype=np.int32)
+
+    def load(self, delta: BoardDelta):
+        """Rebuilds the index from a delta covering every tile."""
+        self.clear()
+        self.visible[np.frombuffer(delta.indices, dtype=np.int64)] = \
+            np.frombuffer(delta.states, dtype=np.uint8)
+        self.rebuild()
+
+    @staticmethod
+    def planes(states: np.ndarray) -> np.ndarray:
+        """Splits visible states into (3, ...) revealed / flagged / known-mine indicators."""
+        revealed = (states & TileBits.REVEALED) != 0
+        flagged = (states & TileBits.FLAGGED) != 0
+        mines = revealed & ((states & TileBits.MINE) != 0)
+        return np.stack((revealed, flagged, mines)).astype(np.int32)
+
+    def record(self, delta: BoardDelta):
+        """Change feed callback: folds one delta into the trees."""
+        self.sync()
+        indices = np.frombuffer(delta.indices, dtype=np.int64)
+        states = np.frombuffer(delta.states, dtype=np.uint8)
+        diff = self.planes(states) - self.planes(self.visible[indices])
+        self.visible[indices] = states
+
+        moved = diff.any(axis=0)
+        indices, diff = indices[moved], diff[:, moved]
+        if not len(indices):
+            return
+        cost = len(indices) * self.height.bit_length() * self.width.bit_length()
+        if cost >= self.visible.size:
+            self.rebuild()
+            return
+
+        ys, xs = np.divmod(indices, self.width)
+        rows = self.chain(ys + 1, self.height, up=True)
+        cols = self.chain(xs + 1, self.width, up=True)
+        rows = np.broadcast_to(rows[:, :, None], rows.shape + cols.shape[1:2])
+        cols = np.broadcast_to(cols[:, None, :], rows.shape)
+        values = np.broadcast_to(diff[:, :, None, None], diff.shape + rows.shape[1:])
+        for plane in range(len(self.PLANES)):
+            np.add.at(self.tree[plane], (rows, cols), values[plane])
+        # Chain slots past the edge were parked in row or column 0.
+        self.tree[:, 0, :] = 0
+        self.tree[:, :, 0] = 0
+
+    @staticmethod
+    def chain(positions: np.ndarray, limit: int, up: bool) -> np.ndarray:
+        """Returns the (n, steps) Fenwick chains of 1-based positions.
+
+        Going up (updates) adds the lowest set bit until past limit; going
+        down (prefix queries) clears it until 0. Finished chains read 0.
+        """
+        steps = [positions]
+        for _ in range(limit.bit_length()):
+            positions = positions + (positions & -positions) if up else positions & (positions - 1)
+            steps.append(positions)
+        chain = np.stack(steps, axis=1)
+        chain[chain > limit] = 0
+        return chain
+
+    def rebuild(self):
+        """Recomputes all trees from the visible plane in O(tiles).
+
+        Each level adds the nodes whose lowest set bit is `step` into node + step.
+        """
+        tree = self.tree
+        tree[:, 1:, 1:] = self.planes(self.visible.reshape(self.height, self.width))
+        for axis, limit in ((1, self.height), (2, self.width)):
+            step = 1
+            while step * 2 <= limit:
+                parents = [slice(None)] * 3
+                children = [slice(None)] * 3
+                parents[axis] = slice(2 * step, limit + 1, 2 * step)
+                children[axis] = slice(step, limit + 1 - step, 2 * step)
+                tree[tuple(parents)] += tree[tuple(children)]
+                step *= 2
+
+    def prefix(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Returns the (3, n) counts of the rectangles [0, xs) x [0, ys)."""
+        rows = self.chain(ys, self.height, up=False)
+        cols = self.chain(xs, self.width, up=False)
+        return self.tree[:, rows[:, :, None], cols[:, None, :]].sum(axis=(2, 3))
+
+    def query(self, rects) -> np.ndarray:
+        """Counts many rectangles at once.
+
+        rects is an (n, 4) array-like of (x0, y0, x1, y1). Returns an (n, 3)
+        int array of revealed, flagged and known-mine counts.
+        """
+        self.sync()
+        rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+        x0, x1 = np.clip(rects[:, 0], 0, self.width), np.clip(rects[:, 2], 0, self.width)
+        y0, y1 = np.clip(rects[:, 1], 0, self.height), np.clip(rects[:, 3], 0, self.height)
+        x1, y1 = np.maximum(x0, x1), np.maximum(y0, y1)
+        counts = (self.prefix(x1, y1) - self.prefix(x0, y1) -
+                  self.prefix(x1, y0) + self.prefix(x0, y0))
+        return counts.T
+
+    def count(self, x0: int, y0: int, x1: int, y1: int) -> Tuple[int, int, int]:
+        """Returns (revealed, flagged, known mines) inside [x0, x1) x [y0, y1).
+
+        The four corner prefixes share one gather: rows and columns of the
+        upper corners count +1, those of the lower corners -1.
+        """
+        self.sync()
+        x0, x1 = min(max(x0, 0), self.width), min(max(x1, 0), self.width)
+        y0, y1 = min(max(y0, 0), self.height), min(max(y1, 0), self.height)
+        if x1 <= x0 or y1 <= y0:
+            return 0, 0, 0
+        rows, row_signs = self.signed_chain(y0, y1)
+        cols, col_signs = self.signed_chain(x0, x1)
+        block = self.tree[:, rows[:, None], cols[None, :]]
+        revealed, flagged, mines = block @ col_signs @ row_signs
+        return int(revealed), int(flagged), int(mines)
+
+    @staticmethod
+    def signed_chain(low: int, high: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the prefix-query nodes of high (+1) and low (-1) with their signs."""
+        nodes, signs = [], []
+        for position, sign in ((high, 1), (low, -1)):
+            while position:
+                nodes.append(position)
+                signs.append(sign)
+                position &= position - 1
+        return np.array(nodes, dtype=np.intp), np.array(signs, dtype=np.int64)
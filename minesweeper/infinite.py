@@ -0,0 +1,268 @@
+"""Unbounded board generated lazily in chunks."""
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import tempfile
+import weakref
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Callable, Tuple, List, Optional
+
+import numpy as np
+
+from .config import GameConfig, TileBits
+from .seeding import MASK64, cell_keys, mix64
+from .feed import BoardDelta, ChangeFeed
+
+
+MASK32 = (1 << 32) - 1
+
+
+def tile_keys(base: int, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Returns the 64-bit keys of tiles at world coordinates (xs, ys).
+
+    Like cell_keys, but the counter is the packed signed coordinate pair
+    rather than a flat index, so it is defined for the whole plane.
+    """
+    counters = ((xs.astype(np.int64) & MASK32).astype(np.uint64) << np.uint64(32)) | \
+        (ys.astype(np.int64) & MASK32).astype(np.uint64)
+    return cell_keys(base, counters)
+
+
+class ChunkStore:
+    """On-disk store for the player state of evicted chunks.
+
+    Mines and counts are regenerated from the seed, so only the REVEALED
+    and FLAGGED bits are kept: two packed bit planes per chunk, zlib
+    compressed, one small file per chunk in `path`. Without a path the
+    store uses a temporary directory, removed by close() or once the store
+    is garbage collected.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = tempfile.mkdtemp(prefix="minesweeper-chunks-")
+            self.cleanup = weakref.finalize(self, shutil.rmtree, path, ignore_errors=True)
+        else:
+            self.cleanup = None
+            os.makedirs(path, exist_ok=True)
+        self.path = path
+
+    def close(self):
+        """Removes the temporary directory, if this store created one."""
+        if self.cleanup is not None:
+            self.cleanup()
+
+    def file_name(self, key: Tuple[int, int]) -> str:
+        return os.path.join(self.path, f"{key[0]}_{key[1]}.chunk")
+
+    def save(self, key: Tuple[int, int], cells: np.ndarray):
+        """Writes the player state of one chunk."""
+        planes = np.packbits(np.stack((cells & TileBits.REVEALED != 0,
+                                       cells & TileBits.FLAGGED != 0)))
+        with open(self.file_name(key), "wb") as f:
+            f.write(zlib.compress(planes.tobytes()))
+
+    def load(self, key: Tuple[int, int], cells: np.ndarray) -> bool:
+        """ORs a stored chunk's player state into cells; False if none is stored."""
+        try:
+            with open(self.file_name(key), "rb") as f:
+                data = zlib.decompress(f.read())
+        except FileNotFoundError:
+            return False
+        planes = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=2 * cells.size)
+        revealed, flagged = planes.reshape((2,) + cells.shape).astype(bool)
+        cells[revealed] |= TileBits.REVEALED
+        cells[flagged] |= TileBits.FLAGGED
+        return True
+
+    def discard(self, key: Tuple[int, int]):
+        """Deletes a stored chunk, if any."""
+        try:
+            os.remove(self.file_name(key))
+        except FileNotFoundError:
+            pass
+
+
+class InfiniteBoard(ChangeFeed):
+    """Unbounded board divided into CHUNK_SIZE x CHUNK_SIZE chunks.
+
+    A tile is a mine when its seeded key falls below density * 2**64, so
+    every chunk, halo included, can be generated on its own the first
+    time it is touched. Chunks use the packed TileBits layout of Board and
+    live in an LRU of `cache_chunks` entries; an evicted chunk with player
+    state goes to a ChunkStore and one without is dropped (along with any
+    stale stored copy), so memory stays bounded by the active area.
+
+    World coordinates are limited to +-WORLD_LIMIT so a tile packs into
+    one BoardDelta index as y * 2**32 + x (see tile_index).
+    """
+
+    CHUNK_SIZE = 32
+    WORLD_LIMIT = 1 << 30
+    # Zero tiles must not percolate, or a cascade would never stop. With
+    # independent mines a tile is zero with probability (1 - d)**9, which
+    # has to stay well below the ~0.41 site-percolation threshold of the
+    # 8-connected square lattice: 0.23 at 0.15, whereas 0.1 (0.39) is near
+    # critical and first clicks there cascaded over 150k tiles.
+    MIN_DENSITY = 0.15
+
+    def __init__(self, config: GameConfig, cache_chunks: int = 256,
+                 store: Optional[ChunkStore] = None):
+        density = config.num_mines / (config.grid_width * config.grid_height)
+        if not self.MIN_DENSITY <= density < 1:
+            raise ValueError(
+                f"Infinite boards need a mine density in [{self.MIN_DENSITY}, 1), got {density:.3f}"
+            )
+        self.config = config
+        self.seed = config.seed if config.seed is not None else random.getrandbits(64)
+        self.base = mix64(mix64(self.seed) ^ 0x1F1F1F1F)
+        self.threshold = np.uint64(min(int(density * 2 ** 64), MASK64))
+        self.cache_chunks = cache_chunks
+        self.store = store or ChunkStore()
+        self.chunks: OrderedDict[Tuple[int, int], np.ndarray] = OrderedDict()
+        self.subscribers: List[Callable[[BoardDelta], None]] = []
+        self.safe_origin: Optional[Tuple[int, int]] = None
+        self.revealed_count = 0
+        self.flags_placed = 0
+        self.zobrist = 0
+
+    @staticmethod
+    def tile_index(x: int, y: int) -> int:
+        """Packs world coordinates into one BoardDelta index."""
+        return (y << 32) + x
+
+    @staticmethod
+    def tile_position(index: int) -> Tuple[int, int]:
+        """Inverse of tile_index; returns (x, y)."""
+        y = (index + (1 << 31)) >> 32
+        return index - (y << 32), y
+
+    def in_world(self, x: int, y: int) -> bool:
+        return -self.WORLD_LIMIT <= x < self.WORLD_LIMIT and -self.WORLD_LIMIT <= y < self.WORLD_LIMIT
+
+    def generate_chunk(self, cx: int, cy: int) -> np.ndarray:
+        """Builds the mines and counts of one chunk from the seed."""
+        size = self.CHUNK_SIZE
+        # Mines of the chunk plus a one-tile halo from its neighbors.
+        ys, xs = np.mgrid[cy * size - 1:(cy + 1) * size + 1, cx * size - 1:(cx + 1) * size + 1]
+        mines = tile_keys(self.base, xs, ys) < self.threshold
+        if self.safe_origin is not None:
+            ox, oy = self.safe_origin
+            radius = self.config.safe_zone_radius
+            mines &= (np.abs(xs - ox) > radius) | (np.abs(ys - oy) > radius)
+
+        counts = mines.astype(np.uint8)
+        counts = counts[:, :-2] + counts[:, 1:-1] + counts[:, 2:]
+        counts = counts[:-2] + counts[1:-1] + counts[2:]
+        inner = mines[1:-1, 1:-1]
+        return np.where(inner, np.uint8(TileBits.MINE), counts).astype(np.uint8)
+
+    def chunk(self, cx: int, cy: int) -> np.ndarray:
+        """Returns a chunk's cells, loading or generating it as needed."""
+        key = (cx, cy)
+        cells = self.chunks.get(key)
+        if cells is not None:
+            self.chunks.move_to_end(key)
+            return cells
+
+        cells = self.generate_chunk(cx, cy)
+        self.store.load(key, cells)
+        self.chunks[key] = cells
+        while len(self.chunks) > self.cache_chunks:
+            self.evict(*self.chunks.popitem(last=False))
+        return cells
+
+    def evict(self, key: Tuple[int, int], cells: np.ndarray):
+        """Saves a chunk's player state, or deletes a stale copy if it has none."""
+        if (cells & (TileBits.REVEALED | TileBits.FLAGGED)).any():
+            self.store.save(key, cells)
+        else:
+            self.store.discard(key)
+
+    def tile_state(self, x: int, y: int) -> int:
+        """Returns the packed TileBits state of a tile."""
+        cx, lx = divmod(x, self.CHUNK_SIZE)
+        cy, ly = divmod(y, self.CHUNK_SIZE)
+        return int(self.chunk(cx, cy)[ly, lx])
+
+    def set_bits(self, x: int, y: int, bits: int):
+        cx, lx = divmod(x, self.CHUNK_SIZE)
+        cy, ly = divmod(y, self.CHUNK_SIZE)
+        self.chunk(cx, cy)[ly, lx] |= bits
+
+    def reveal_tile(self, x: int, y: int) -> BoardDelta:
+        """Reveals a tile and iteratively reveals neighbors if it's empty.
+
+        The first reveal fixes the safe zone. Chunks touched before it
+        (only ever by flags) are regenerated around the zone, keeping
+        their flags.
+        """
+        if not self.in_world(x, y):
+            return BoardDelta()
+        if self.safe_origin is None:
+            self.safe_origin = (x, y)
+            for (cx, cy), cells in self.chunks.items():
+                cells[...] = self.generate_chunk(cx, cy) | (cells & TileBits.FLAGGED)
+        return self.publish(self.make_delta(self.open_tile(x, y)))
+
+    def open_tile(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Reveals a tile and its cascade without publishing; returns the tiles revealed."""
+        if self.tile_state(x, y) & (TileBits.REVEALED | TileBits.FLAGGED):
+            return []
+        changed = []
+        stack = [(x, y)]
+        while stack:
+            x, y = stack.pop()
+            tile = self.tile_state(x, y)
+            if tile & (TileBits.REVEALED | TileBits.FLAGGED):
+                continue
+            self.set_bits(x, y, TileBits.REVEALED)
+            changed.append((x, y))
+            if tile & (TileBits.MINE | TileBits.COUNT):
+                continue
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if (dx or dy) and self.in_world(x + dx, y + dy):
+                        stack.append((x + dx, y + dy))
+        self.revealed_count += len(changed)
+        return changed
+
+    def toggle_flag(self, x: int, y: int) -> BoardDelta:
+        """Toggles flag on a tile. Returns the change, empty if nothing happened."""
+        if not self.in_world(x, y) or self.tile_state(x, y) & TileBits.REVEALED:
+            return BoardDelta()
+        cx, lx = divmod(x, self.CHUNK_SIZE)
+        cy, ly = divmod(y, self.CHUNK_SIZE)
+        cells = self.chunk(cx, cy)
+        cells[ly, lx] ^= TileBits.FLAGGED
+        self.flags_placed += 1 if cells[ly, lx] & TileBits.FLAGGED else -1
+        return self.publish(self.make_delta([(x, y)]))
+
+    def make_delta(self, tiles: List[Tuple[int, int]]) -> BoardDelta:
+        """Builds a BoardDelta, indexed by tile_index, from the current state of tiles."""
+        states = bytearray()
+        for x, y in tiles:
+            state = self.tile_state(x, y)
+            states.append(state if state & TileBits.REVEALED else state & TileBits.FLAGGED)
+        return BoardDelta(array('q', [self.tile_index(x, y) for x, y in tiles]), bytes(states))
+
+    def flush(self):
+        """Brings the store up to date with every cached chunk."""
+        for key, cells in self.chunks.items():
+            self.evict(key, cells)
+
+    def is_mine(self, x: int, y: int) -> bool:
+        """Returns True if the tile holds a mine."""
+        return bool(self.tile_state(x, y) & TileBits.MINE)
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        """Returns True if the tile has been revealed."""
+        return bool(self.tile_state(x, y) & TileBits.REVEALED)
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        """Returns True if the tile carries a flag."""
+        return bool(self.tile_state(x, y) & TileBits.FLAGGED)
@@ -0,0 +1,79 @@
+"""Move journal backing undo and redo in practice mode."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import List, Optional
+
+from .feed import BoardDelta, UNDO_STATES
+
+
+class MoveJournal:
+    """Undo/redo history recorded from a board's change feed.
+
+    Each move is stored as the deltas it published, i.e. 9 bytes per
+    changed tile, never a copy of the board. Undoing inverts the states
+    with a byte translation table and hands them to board.apply_states,
+    so both directions cost O(tiles changed).
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.undo_stack: List[List[BoardDelta]] = []
+        self.redo_stack: List[List[BoardDelta]] = []
+        self.pending: Optional[List[BoardDelta]] = None
+        self.replaying = False
+        board.subscribe(self.record)
+
+    def record(self, delta: BoardDelta):
+        """Change feed callback: files a delta under the current move."""
+        if self.replaying:
+            return
+        if self.pending is not None:
+            self.pending.append(delta)
+        else:
+            self.undo_stack.append([delta])
+        self.redo_stack.clear()
+
+    @contextmanager
+    def move(self):
+        """Groups every delta published inside the block into one undoable move."""
+        self.pending = []
+        try:
+            yield
+        finally:
+            if self.pending:
+                self.undo_stack.append(self.pending)
+            self.pending = None
+
+    def undo(self) -> List[BoardDelta]:
+        """Reverts the last move; returns the deltas applied (empty if none)."""
+        if not self.undo_stack:
+            return []
+        move = self.undo_stack.pop()
+        self.redo_stack.append(move)
+        return self.replay([BoardDelta(delta.indices, delta.states.translate(UNDO_STATES))
+                            for delta in reversed(move)])
+
+    def redo(self) -> List[BoardDelta]:
+        """Reapplies the last undone move; returns the deltas applied."""
+        if not self.redo_stack:
+            return []
+        move = self.redo_stack.pop()
+        self.undo_stack.append(move)
+        return self.replay(move)
+
+    def replay(self, deltas: List[BoardDelta]) -> List[BoardDelta]:
+        self.replaying = True
+        try:
+            return [self.board.apply_states(delta) for delta in deltas]
+        finally:
+            self.replaying = False
+
+    def clear(self):
+        """Forgets the whole history, e.g. when the board is reset."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def detach(self):
+        """Stops recording from the board."""
+        self.board.unsubscribe(self.record)
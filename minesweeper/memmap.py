@@ -0,0 +1,200 @@
+"""Board backed by a memory-mapped file, for gigantic boards."""
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .config import GameConfig, TileBits
+from .geometry import GEOMETRY_CACHE
+from .seeding import cell_keys, stream_base
+from .board import Board, safe_zone, uncompact
+
+
+class MemmapBoard(Board):
+    """Board whose plane lives in a memory-mapped file, for gigantic boards.
+
+    The file is a HEADER_SIZE-byte header followed by the packed TileBits
+    plane, one byte per tile (20000x20000 is 400 MB on disk). The OS pages
+    in only the rows being played, and the file is created sparse, so a
+    new board costs no writes. The running counters live in the header
+    too, which makes the file an always-current save: MemmapBoard.open
+    resumes it.
+
+    Whole-board passes (mine placement, neighbor counts) run in bands of
+    BAND_ROWS rows, opening tables are skipped in favour of the row-sweep
+    flood fill, and neighbors are computed arithmetically instead of from
+    the shared CSR tables, so memory use stays independent of board size.
+    """
+
+    MAGIC = b"MSWPMAP1"
+    HEADER = np.dtype([
+        ("magic", "S8"), ("width", "<u4"), ("height", "<u4"), ("num_mines", "<u8"),
+        ("safe_tiles_left", "<i8"), ("flags_placed", "<i8"), ("zobrist", "<u8"),
+        ("generated", "u1"),
+    ])
+    HEADER_SIZE = 64
+    BAND_ROWS = 1024
+    # Seeded placement hashes KEY_TILES tiles at a time and buckets keys by
+    # their top KEY_BITS bits.
+    KEY_TILES = 1 << 20
+    KEY_BITS = 16
+
+    def __init__(self, config: GameConfig, path: str, resume: bool = False):
+        if config.topology != "square":
+            raise ValueError("MemmapBoard only supports the square topology")
+        self.path = path
+        self.header: Optional[np.memmap] = None
+        self.resume = resume
+        super().__init__(config)
+        self.resume = False
+
+    @classmethod
+    def open(cls, path: str) -> 'MemmapBoard':
+        """Resumes a board from its backing file."""
+        header = np.fromfile(path, dtype=cls.HEADER, count=1)
+        if not len(header) or header[0]["magic"] != cls.MAGIC:
+            raise ValueError(f"{path} is not a saved board")
+        header = header[0]
+        config = GameConfig.custom(int(header["width"]), int(header["height"]),
+                                   int(header["num_mines"]))
+        return cls(config, path, resume=True)
+
+    @property
+    def safe_tiles_left(self) -> int:
+        return int(self.header[0]["safe_tiles_left"]) if self.header is not None else 0
+
+    @safe_tiles_left.setter
+    def safe_tiles_left(self, value: int):
+        if self.header is not None:
+            self.header[0]["safe_tiles_left"] = value
+
+    @property
+    def flags_placed(self) -> int:
+        return int(self.header[0]["flags_placed"]) if self.header is not None else 0
+
+    @flags_placed.setter
+    def flags_placed(self, value: int):
+        if self.header is not None:
+            self.header[0]["flags_placed"] = value
+
+    @property
+    def zobrist(self) -> int:
+        return int(self.header[0]["zobrist"]) if self.header is not None else 0
+
+    @zobrist.setter
+    def zobrist(self, value: int):
+        if self.header is not None:
+            self.header[0]["zobrist"] = value
+
+    @property
+    def generated(self) -> bool:
+        """True once mines have been placed, i.e. the first click happened."""
+        return bool(self.header[0]["generated"])
+
+    def create_board(self):
+        """Creates the backing file (unless resuming) and maps it."""
+        width, height = self.config.grid_width, self.config.grid_height
+        self.geometry = GEOMETRY_CACHE.get(width, height)
+        self.cells = self.header = None
+        if not self.resume:
+            with open(self.path, "wb") as f:
+                f.truncate(self.HEADER_SIZE + width * height)
+
+        self.header = np.memmap(self.path, dtype=self.HEADER, mode="r+", shape=(1,))
+        self.cells = np.memmap(self.path, dtype=np.uint8, mode="r+",
+                               offset=self.HEADER_SIZE, shape=(height, width))
+        if not self.resume:
+            self.header[0]["magic"] = self.MAGIC
+            self.header[0]["width"] = width
+            self.header[0]["height"] = height
+            self.header[0]["num_mines"] = self.config.num_mines
+            self.clear_state()
+
+    def reset(self):
+        """Starts a new game on a fresh sparse file rather than zeroing every page."""
+        self.detach_rows(0, self.cells.shape[0])
+        self.create_board()
+        self.generation += 1
+
+    def flush(self):
+        """Writes dirty pages back to the file."""
+        self.header.flush()
+        self.cells.flush()
+
+    def place_mines(self, first_click_pos: Optional[Tuple[int, int]]):
+        """Places mines band by band, avoiding the first click area.
+
+        Each band draws its mine count from the hypergeometric distribution,
+        so the layout is as uniform as Board.place_mines. Seeded configs get
+        the seeded_mines layout (see place_seeded_mines).
+        """
+        width, height = self.config.grid_width, self.config.grid_height
+        excluded, available = safe_zone(self.config, first_click_pos)
+        self.detach_rows(0, height)
+        if self.config.seed is not None:
+            self.place_seeded_mines(excluded)
+            self.header[0]["generated"] = 1
+            return
+
+        rng = np.random.default_rng()
+        flat = self.cells.reshape(-1)
+        band = self.BAND_ROWS * width
+        mines_left, tiles_left = self.config.num_mines, available
+        for start in range(0, available, band):
+            size = min(band, available - start)
+            count = int(rng.hypergeometric(size, tiles_left - size, mines_left)) if mines_left else 0
+            positions = rng.choice(size, count, replace=False).astype(np.int64) + start
+            flat[uncompact(positions, excluded)] |= TileBits.MINE
+            mines_left -= count
+            tiles_left -= size
+        self.header[0]["generated"] = 1
+
+    def place_seeded_mines(self, excluded: List[int]):
+        """Marks the seeded_mines layout without holding every tile's key at once.
+
+        A first pass histograms the top KEY_BITS of each key to find the
+        bucket holding the num_mines-th smallest; a second marks every mine
+        below that bucket and ranks the bucket's tiles by (key, index).
+        """
+        num_mines = self.config.num_mines
+        if not num_mines:
+            return
+        base = stream_base(self.config)
+        shift = np.uint64(64 - self.KEY_BITS)
+        histogram = np.zeros(1 << self.KEY_BITS, dtype=np.int64)
+        for indices, keys in self.key_chunks(base, excluded):
+            histogram += np.bincount((keys >> shift).astype(np.int64), minlength=histogram.size)
+        bucket = int(np.searchsorted(np.cumsum(histogram), num_mines))
+        needed = num_mines - int(histogram[:bucket].sum())
+
+        flat = self.cells.reshape(-1)
+        low = np.uint64(bucket) << shift
+        tied_indices, tied_keys = [], []
+        for indices, keys in self.key_chunks(base, excluded):
+            flat[indices[keys < low]] |= TileBits.MINE
+            inside = (keys >> shift) == bucket
+            tied_indices.append(indices[inside])
+            tied_keys.append(keys[inside])
+        indices, keys = np.concatenate(tied_indices), np.concatenate(tied_keys)
+        flat[indices[np.lexsort((indices, keys))[:needed]]] |= TileBits.MINE
+
+    def key_chunks(self, base: int, excluded: List[int]) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yields the flat indices and cell keys of the tiles outside excluded, in chunks."""
+        excluded = np.array(excluded, dtype=np.int64)
+        num_cells = self.cells.size
+        for start in range(0, num_cells, self.KEY_TILES):
+            stop = min(start + self.KEY_TILES, num_cells)
+            indices = np.arange(start, stop, dtype=np.int64)
+            skip = excluded[(excluded >= start) & (excluded < stop)]
+            if len(skip):
+                indices = np.delete(indices, skip - start)
+            yield indices, cell_keys(base, indices)
+
+    def calculate_neighbor_mines(self):
+        """Calculates the neighbor counts one band of rows at a time."""
+        for top in range(0, self.cells.shape[0], self.BAND_ROWS):
+            self.count_rows(top, min(top + self.BAND_ROWS, self.cells.shape[0]))
+
+    def label_openings(self):
+        """Skipped: the opening tables would cost several bytes per tile."""
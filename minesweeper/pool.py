@@ -0,0 +1,118 @@
+"""Background pool of pre-generated boards."""
+from __future__ import annotations
+
+import random
+import threading
+from collections import deque
+from typing import Dict, Tuple, Optional
+
+from .config import GameConfig
+from .backends import new_board
+from .board import safe_zone
+
+
+class BoardPool:
+    """Pre-generated boards for the preset difficulties, filled in the background.
+
+    A worker thread keeps up to `capacity` fully prepared boards (mines,
+    counts and openings) per difficulty, each with its mine-free tiles in
+    random order. On the first click, deal() takes the oldest entry and moves any
+    mines inside the safe zone onto the first spare tiles outside it. That
+    is the layout of the first num_mines zone-free tiles of a uniform
+    permutation, so every deal fits and the board is distributed exactly
+    like a freshly generated one. Only an empty pool, or a seeded board,
+    makes the caller generate synchronously.
+    """
+
+    def __init__(self, capacity: int = 8):
+        self.capacity = capacity
+        self.backend = GameConfig.DEFAULT_BACKEND
+        # Per key, (prepared board, its non-mine flat tiles in random order).
+        self.entries: Dict[Tuple, deque] = {}
+        self.condition = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+
+    @staticmethod
+    def key(config: GameConfig) -> Tuple:
+        return (config.backend, config.topology, config.grid_width, config.grid_height,
+                config.num_mines)
+
+    def start(self, backend: str):
+        """Starts (or retargets) the worker for the given board backend."""
+        with self.condition:
+            self.backend = backend
+            self.running = True
+            self.condition.notify_all()
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, name="board-pool", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stops the worker and waits for it to finish its current board."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def next_config(self) -> Optional[GameConfig]:
+        """Returns a preset config whose pool is below capacity, if any."""
+        for difficulty in GameConfig.DIFFICULTY_SETTINGS:
+            config = GameConfig(difficulty)
+            config.backend = self.backend
+            if len(self.entries.get(self.key(config), ())) < self.capacity:
+                return config
+        return None
+
+    def run(self):
+        """Worker loop: tops up each difficulty's pool, then sleeps until dealt from."""
+        while True:
+            with self.condition:
+                config = self.next_config()
+                while self.running and config is None:
+                    self.condition.wait()
+                    config = self.next_config()
+                if not self.running:
+                    return
+
+            entry = self.prepare(config)
+            with self.condition:
+                self.entries.setdefault(self.key(config), deque()).append(entry)
+
+    @staticmethod
+    def prepare(config: GameConfig) -> Tuple:
+        """Generates one pool entry: a prepared board and its shuffled mine-free tiles."""
+        board = new_board(config)
+        board.place_mines(None)
+        board.calculate_neighbor_mines()
+        board.label_openings()
+        width = config.grid_width
+        spares = [index for index in range(width * config.grid_height)
+                  if not board.is_mine(index % width, index // width)]
+        random.shuffle(spares)
+        return board, spares
+
+    def deal(self, board, first_click_pos: Tuple[int, int]) -> bool:
+        """Loads the oldest pooled layout into board, fitted around first_click_pos.
+
+        Returns False, leaving board untouched, when the pool is empty.
+        """
+        if board.config.seed is not None:
+            return False
+        with self.condition:
+            entries = self.entries.get(self.key(board.config))
+            if not entries or type(entries[0][0]) is not type(board):
+                return False
+            entry, spares = entries.popleft()
+            self.condition.notify_all()
+
+        width = board.config.grid_width
+        zone = safe_zone(board.config, first_click_pos)[0]
+        hits = [index for index in zone if entry.is_mine(index % width, index // width)]
+        if hits:
+            inside = set(zone)
+            entry.move_mines(hits, [index for index in spares if index not in inside][:len(hits)])
+        board.load_layout(entry)
+        return True
@@ -0,0 +1,279 @@
+"""Exact mine probabilities from frontier components."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .config import TileBits
+from .solver import Solver
+
+# Polynomials in the number of mines: poly[k] counts the solutions with k
+# mines. Counts are Python ints, so a component's counts are exact.
+Poly = List[int]
+
+
+class ComponentTooLarge(RuntimeError):
+    """A frontier component needs more DP states than the budget allows."""
+
+    def __init__(self, tiles: int, constraints: int, budget: int):
+        super().__init__(f"A frontier component of {tiles} tiles and {constraints} "
+                         f"constraints exceeds the budget of {budget} states")
+        self.tiles = tiles
+        self.constraints = constraints
+
+
+class MineProbabilities:
+    """Exact mine probability of every hidden, unflagged tile of a position.
+
+    cells maps each constrained tile, and each tile the solver has already
+    decided, to its probability. Every other hidden, unflagged tile has
+    probability `interior`.
+    """
+
+    __slots__ = ("cells", "interior")
+
+    def __init__(self, cells: Dict[int, float], interior: float):
+        self.cells = cells
+        self.interior = interior
+
+    def __getitem__(self, index: int) -> float:
+        return self.cells.get(index, self.interior)
+
+    def __repr__(self) -> str:
+        return f"MineProbabilities({len(self.cells)} tiles, interior={self.interior:.4f})"
+
+
+def convolve(a: Poly, b: Poly) -> Poly:
+    """Multiplies two count polynomials."""
+    out = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                out[i + j] += x * y
+    return out
+
+
+def add_into(total: Poly, poly: Poly, shift: int):
+    """Adds poly, shifted up by shift mines, into total in place."""
+    if len(total) < len(poly) + shift:
+        total.extend([0] * (len(poly) + shift - len(total)))
+    for k, count in enumerate(poly):
+        total[k + shift] += count
+
+
+def split_components(constraints: List[Tuple[Set[int], int]]) -> List[List[Tuple[Set[int], int]]]:
+    """Groups constraints into components that share no tiles."""
+    owner: Dict[int, int] = {}
+    parent = list(range(len(constraints)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, (tiles, _) in enumerate(constraints):
+        for tile in tiles:
+            if tile in owner:
+                parent[find(i)] = find(owner[tile])
+            else:
+                owner[tile] = i
+    groups: Dict[int, List[Tuple[Set[int], int]]] = {}
+    for i, constraint in enumerate(constraints):
+        groups.setdefault(find(i), []).append(constraint)
+    return list(groups.values())
+
+
+class Component:
+    """Solution counts of one independent group of constraints.
+
+    Tiles are processed one at a time in breadth-first order, which keeps
+    the set of "open" constraints (those with tiles on both sides of the
+    cut) small along the frontier. A DP state is the mines each open
+    constraint still needs, and carries a polynomial of how many prefix
+    assignments reach it with each mine total. A forward pass gives those
+    prefix counts, a backward pass the matching suffix counts, and their
+    product at each tile gives its per-total mine counts.
+    """
+
+    def __init__(self, constraints: List[Tuple[Set[int], int]], budget: int):
+        self.constraints = constraints
+        self.tiles = self.order()
+        self.budget = budget
+
+    def order(self) -> List[int]:
+        """Returns the component's tiles in breadth-first order over shared constraints."""
+        watching: Dict[int, List[int]] = {}
+        for c, (tiles, _) in enumerate(self.constraints):
+            for tile in tiles:
+                watching.setdefault(tile, []).append(c)
+        start = min(watching)
+        order, seen, queue = [], {start}, deque([start])
+        while queue:
+            tile = queue.popleft()
+            order.append(tile)
+            for c in watching[tile]:
+                for other in sorted(self.constraints[c][0] - seen):
+                    seen.add(other)
+                    queue.append(other)
+        return order
+
+    def solve(self) -> Tuple[Poly, Dict[int, Poly]]:
+        """Returns the solution counts per mine total, overall and with each tile a mine."""
+        position = {tile: i for i, tile in enumerate(self.tiles)}
+        size = len(self.tiles)
+        steps: List[List[int]] = [[] for _ in range(size)]
+        last = []
+        for c, (tiles, _) in enumerate(self.constraints):
+            spots = [position[tile] for tile in tiles]
+            for spot in spots:
+                steps[spot].append(c)
+            last.append(max(spots))
+        # left[c]: tiles of constraint c after the current position.
+        left = [len(tiles) for tiles, _ in self.constraints]
+
+        layers: List[Dict[Tuple[int, ...], Poly]] = [{(): [1]}]
+        moves: List[Dict[Tuple[int, ...], Tuple[Optional[tuple], Optional[tuple]]]] = []
+        # Open constraints at the current cut, in a fixed order so states are tuples.
+        before: Tuple[int, ...] = ()
+        states = 1
+        for i in range(size):
+            for c in steps[i]:
+                left[c] -= 1
+            after = tuple(sorted(c for c in set(before) | set(steps[i]) if last[c] > i))
+            layer: Dict[Tuple[int, ...], Poly] = {}
+            step_moves = {}
+            for state, poly in layers[i].items():
+                needs = dict(zip(before, state))
+                targets = []
+                for mine in (0, 1):
+                    target = self.advance(needs, steps[i], mine, left, after)
+                    targets.append(target)
+                    if target is not None:
+                        add_into(layer.setdefault(target, []), poly, mine)
+                step_moves[state] = tuple(targets)
+            states += len(layer)
+            if states > self.budget:
+                raise ComponentTooLarge(size, len(self.constraints), self.budget)
+            layers.append(layer)
+            moves.append(step_moves)
+            before = after
+
+        suffix: Dict[Tuple[int, ...], Poly] = {(): [1]}
+        per_tile: Dict[int, Poly] = {}
+        for i in range(size - 1, -1, -1):
+            earlier: Dict[Tuple[int, ...], Poly] = {}
+            with_mine: Poly = [0]
+            for state, targets in moves[i].items():
+                counts: Poly = []
+                for mine, target in enumerate(targets):
+                    if target is not None:
+                        add_into(counts, suffix[target], mine)
+                earlier[state] = counts or [0]
+                if targets[1] is not None:
+                    tail = [0] + suffix[targets[1]]
+                    add_into(with_mine, convolve(layers[i][state], tail), 0)
+            per_tile[self.tiles[i]] = with_mine
+            suffix = earlier
+        return layers[size].get((), [0]), per_tile
+
+    def advance(self, needs: Dict[int, int], constraints: List[int], mine: int,
+                left: List[int], after: Tuple[int, ...]) -> Optional[Tuple[int, ...]]:
+        """Returns the state after the current tile, or None if that breaks a constraint."""
+        needs = dict(needs)
+        for c in constraints:
+            need = needs.get(c, self.constraints[c][1]) - mine
+            if need < 0 or need > left[c]:
+                return None
+            needs[c] = need
+        return tuple(needs[c] for c in after)
+
+
+def mine_probabilities(solver: Solver, budget: int = 200_000) -> MineProbabilities:
+    """Computes the exact mine probability of every hidden, unflagged tile.
+
+    Raises ComponentTooLarge when a component needs more than budget DP
+    states, and ValueError when no layout matches the board (a wrong flag).
+    """
+    constraints = solver.constraints()
+    visible = solver.frontier.visible[:-1]
+    hidden = int(np.count_nonzero((visible & (TileBits.REVEALED | TileBits.FLAGGED)) == 0))
+    known_mines = int(np.count_nonzero(
+        ((visible & TileBits.FLAGGED) != 0) |
+        ((visible & (TileBits.REVEALED | TileBits.MINE)) == (TileBits.REVEALED | TileBits.MINE))))
+    mines_left = solver.board.config.num_mines - known_mines - len(solver.mines)
+
+    components = []
+    constrained = 0
+    for group in split_components(constraints):
+        component = Component(group, budget)
+        constrained += len(component.tiles)
+        totals, per_tile = component.solve()
+        # Combined in floats: the interior binomials run to thousands of
+        # digits on big boards. Every scale cancels in the final division.
+        shift = max(0, max(totals).bit_length() - 900)
+        scale = max(totals) >> shift
+        components.append((scaled(totals, shift, scale),
+                           {tile: scaled(counts, shift, scale) for tile, counts in per_tile.items()}))
+    interior = hidden - len(solver.safe) - len(solver.mines) - constrained
+    ways = interior_ways(interior, mines_left, constrained)
+
+    prefix = [np.ones(1)]
+    for totals, _ in components:
+        prefix.append(normalized(np.convolve(prefix[-1], totals)))
+    everything = prefix[-1] * ways[:len(prefix[-1])]
+    layouts = everything.sum()
+    if not layouts > 0:
+        raise ValueError("No mine layout matches the visible board")
+
+    cells: Dict[int, float] = dict.fromkeys(solver.safe, 0.0)
+    cells.update(dict.fromkeys(solver.mines, 1.0))
+    # after[t]: weight of t mines placed before the current component, summed
+    # over the components after it and the interior.
+    after = ways
+    for c in range(len(components) - 1, -1, -1):
+        totals, per_tile = components[c]
+        weights = windows(after, len(totals)) @ np.pad(prefix[c], (0, len(after) - len(prefix[c])))
+        norm = totals @ weights
+        for tile, counts in per_tile.items():
+            cells[tile] = float(counts @ weights[:len(counts)] / norm)
+        after = normalized(windows(after, len(totals)).T @ totals)
+
+    inside = 0.0
+    if interior:
+        left = mines_left - np.arange(len(everything))
+        inside = float(everything @ left / (layouts * interior))
+    return MineProbabilities(cells, inside)
+
+
+def scaled(poly: Poly, shift: int, scale: int) -> np.ndarray:
+    """Converts an integer count polynomial to floats, divided by scale."""
+    return np.array([(count >> shift) / scale for count in poly])
+
+
+def normalized(values: np.ndarray) -> np.ndarray:
+    """Divides values by their largest entry, if any is nonzero."""
+    peak = values.max(initial=0.0)
+    return values / peak if peak > 0 else values
+
+
+def windows(values: np.ndarray, width: int) -> np.ndarray:
+    """Returns the (width, len(values)) view whose row k is values shifted down by k."""
+    padded = np.concatenate((values, np.zeros(width - 1)))
+    return np.lib.stride_tricks.sliding_window_view(padded, len(values))[:width]
+
+
+def interior_ways(interior: int, mines_left: int, constrained: int) -> np.ndarray:
+    """Returns C(interior, mines_left - t) for t = 0..constrained, up to a common factor.
+
+    Built from logs of the ratio C(n, m - 1) / C(n, m) = m / (n - m + 1).
+    """
+    ways = np.zeros(constrained + 1)
+    low, high = max(0, mines_left - interior), min(constrained, mines_left)
+    if low <= high:
+        mines = mines_left - np.arange(low, high, dtype=float)
+        logs = np.concatenate(([0.0], np.cumsum(np.log(mines / (interior - mines + 1)))))
+        ways[low:high + 1] = np.exp(logs - logs.max())
+    return ways
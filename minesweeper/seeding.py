@@ -0,0 +1,71 @@
+"""Counter-based hashing for seeded, reproducible mine layouts."""
+from __future__ import annotations
+
+import heapq
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:  # Only the "bitboard" backend is available without NumPy.
+    np = None
+
+from .config import GameConfig
+
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def mix64(value: int) -> int:
+    """Scrambles a 64-bit integer with the splitmix64 finalizer."""
+    value &= MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+def stream_base(config: GameConfig) -> int:
+    """Returns the hash stream shared by all tiles of a seeded board."""
+    return mix64(mix64(config.seed) ^ (config.grid_width << 32 | config.grid_height))
+
+
+def cell_key(base: int, index: int) -> int:
+    """Returns the 64-bit key of one tile: splitmix64 at counter index + 1."""
+    return mix64(base + (index + 1) * GOLDEN_GAMMA)
+
+
+def cell_keys(base: int, indices: np.ndarray) -> np.ndarray:
+    """Vectorized cell_key over an array of flat indices (uint64 result)."""
+    with np.errstate(over="ignore"):
+        z = np.uint64(base) + (indices.astype(np.uint64) + np.uint64(1)) * np.uint64(GOLDEN_GAMMA)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def seeded_mines(config: GameConfig, excluded: List[int]) -> List[int]:
+    """Returns the mine indices of a seeded board, sorted ascending.
+
+    The mines are the num_mines tiles outside the safe zone with the lowest
+    (key, index), each key hashed from (seed, size, index).
+    """
+    width, height = config.grid_width, config.grid_height
+    num_mines = config.num_mines
+    if num_mines == 0:
+        return []
+    base = stream_base(config)
+
+    if np is None:
+        skip = set(excluded)
+        keyed = ((cell_key(base, index), index)
+                 for index in range(width * height) if index not in skip)
+        return sorted(index for _, index in heapq.nsmallest(num_mines, keyed))
+
+    allowed = np.ones(width * height, dtype=bool)
+    allowed[excluded] = False
+    cells = np.flatnonzero(allowed)
+    keys = cell_keys(base, cells)
+    threshold = np.partition(keys, num_mines - 1)[num_mines - 1]
+    below = cells[keys < threshold]
+    ties = cells[keys == threshold][:num_mines - len(below)]
+    return np.sort(np.concatenate((below, ties))).tolist()
@@ -0,0 +1,252 @@
+"""Copy-on-write board snapshots."""
+from __future__ import annotations
+
+import weakref
+from array import array
+from typing import Callable, Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # Only the "bitboard" backend is available without NumPy.
+    np = None
+
+from .config import TileBits
+from .feed import BoardDelta, ChangeFeed
+
+
+class SnapshotSource:
+    """Copy-on-write bookkeeping shared by Board and BoardSnapshot.
+
+    Holders keep `snapshots`, a WeakSet of their live forks, and must call
+    detach_rows before writing to any row, so each fork first takes its
+    own copy of the row chunks about to change.
+    """
+
+    def fork(self) -> 'BoardSnapshot':
+        """Returns an O(1) copy-on-write snapshot of the current state."""
+        return BoardSnapshot(self)
+
+    def detach_rows(self, top: int, bottom: int):
+        """Hands live snapshots their own copy of rows [top, bottom) before a write."""
+        if self.snapshots:
+            for snapshot in list(self.snapshots):
+                snapshot.adopt_rows(top, bottom)
+
+    def detach_indices(self, indices: np.ndarray):
+        """detach_rows for the rows spanned by some flat tile indices."""
+        if len(indices):
+            width = self.config.grid_width
+            self.detach_rows(int(indices.min()) // width, int(indices.max()) // width + 1)
+
+
+class BoardSnapshot(SnapshotSource, ChangeFeed):
+    """Copy-on-write fork of a Board, or of another snapshot, for what-if probing.
+
+    The packed plane is split into chunks of CHUNK_ROWS rows. A new
+    snapshot owns no chunks and reads through to its parent; a chunk is
+    copied into it the first time either side writes there, so forking
+    is O(1) and memory grows with the chunks modified since. Moves made
+    on a snapshot never reach the parent. Mines and counts are shared as
+    of the fork; the snapshot is meant for probing a generated board.
+    It has Board's move methods and change feed, so Frontier, RectIndex
+    and Solver can follow it; it is never reset, so `generation` stays
+    the parent's at the fork.
+    """
+
+    CHUNK_ROWS = 16
+
+    def __init__(self, parent: SnapshotSource):
+        self.parent = parent
+        self.config = parent.config
+        self.geometry = parent.geometry
+        self.subscribers: List[Callable[[BoardDelta], None]] = []
+        self.snapshots: weakref.WeakSet = weakref.WeakSet()
+        self.chunks: Dict[int, np.ndarray] = {}
+        self.safe_tiles_left = parent.safe_tiles_left
+        self.flags_placed = parent.flags_placed
+        self.zobrist = parent.zobrist
+        self.generation = parent.generation
+        parent.snapshots.add(self)
+
+    def read_chunk(self, chunk: int) -> np.ndarray:
+        """Returns the rows of one chunk, owned or inherited; do not write to it."""
+        rows = self.chunks.get(chunk)
+        return rows if rows is not None else self.parent.read_chunk(chunk)
+
+    def adopt_rows(self, top: int, bottom: int):
+        """Copies the chunks covering rows [top, bottom) that are still inherited."""
+        for chunk in range(top // self.CHUNK_ROWS, (bottom - 1) // self.CHUNK_ROWS + 1):
+            if chunk not in self.chunks:
+                self.chunks[chunk] = self.parent.read_chunk(chunk).copy()
+
+    def tile_state(self, x: int, y: int) -> int:
+        """Returns the packed TileBits state of a tile."""
+        return int(self.read_chunk(y // self.CHUNK_ROWS)[y % self.CHUNK_ROWS, x])
+
+    def set_state(self, x: int, y: int, state: int):
+        self.detach_rows(y, y + 1)
+        self.adopt_rows(y, y + 1)
+        self.chunks[y // self.CHUNK_ROWS][y % self.CHUNK_ROWS, x] = state
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.config.grid_width and 0 <= y < self.config.grid_height
+
+    def reveal_tile(self, x: int, y: int) -> BoardDelta:
+        """Reveals a tile and iteratively reveals neighbors if it's empty."""
+        return self.publish(self.make_delta(self.open_tile(x, y)))
+
+    def reveal_many(self, cells) -> BoardDelta:
+        """Reveals every listed tile, cascading as usual, as one published delta.
+
+        cells is an iterable of (x, y) pairs or an (n, 2) array.
+        """
+        changed = []
+        for x, y in cells:
+            changed.extend(self.open_tile(int(x), int(y)))
+        return self.publish(self.make_delta(changed))
+
+    def open_tile(self, x: int, y: int) -> List[int]:
+        """Reveals a tile and its cascade without publishing; returns the flat indices revealed."""
+        if not self.in_bounds(x, y):
+            return []
+        width = self.config.grid_width
+        changed = []
+        stack = [y * width + x]
+        while stack:
+            index = stack.pop()
+            y, x = divmod(index, width)
+            tile = self.tile_state(x, y)
+            if tile & (TileBits.REVEALED | TileBits.FLAGGED):
+                continue
+            self.set_state(x, y, tile | TileBits.REVEALED)
+            changed.append(index)
+            if not tile & TileBits.MINE:
+                self.safe_tiles_left -= 1
+            if not tile & (TileBits.MINE | TileBits.COUNT):
+                stack.extend(int(neighbor) for neighbor in self.geometry.neighbors(index))
+        return changed
+
+    def chord(self, x: int, y: int) -> BoardDelta:
+        """Reveals the hidden neighbors of a number whose flags are all placed, as one delta."""
+        if not self.in_bounds(x, y):
+            return BoardDelta()
+        tile = self.tile_state(x, y)
+        count = tile & TileBits.COUNT
+        if not tile & TileBits.REVEALED or tile & TileBits.MINE or not count:
+            return BoardDelta()
+
+        width = self.config.grid_width
+        neighbors = [divmod(int(index), width)[::-1]
+                     for index in self.geometry.neighbors(y * width + x)]
+        if sum(self.is_flagged(nx, ny) for nx, ny in neighbors) != count:
+            return BoardDelta()
+        changed = []
+        for nx, ny in neighbors:
+            changed.extend(self.open_tile(nx, ny))
+        return self.publish(self.make_delta(changed))
+
+    def reveal_all_mines(self) -> BoardDelta:
+        """Reveals all mines on the board."""
+        width = self.config.grid_width
+        changed = []
+        for chunk in range(self.num_chunks):
+            rows = self.read_chunk(chunk)
+            hidden = np.flatnonzero((rows & (TileBits.MINE | TileBits.REVEALED)) == TileBits.MINE)
+            if len(hidden):
+                top = chunk * self.CHUNK_ROWS
+                self.detach_rows(top, top + len(rows))
+                self.adopt_rows(top, top + len(rows))
+                self.chunks[chunk].reshape(-1)[hidden] |= TileBits.REVEALED
+                changed.extend((hidden + top * width).tolist())
+        return self.publish(self.make_delta(changed))
+
+    def toggle_flag(self, x: int, y: int) -> BoardDelta:
+        """Toggles flag on a tile. Returns the change, empty if nothing happened."""
+        if not self.in_bounds(x, y) or self.tile_state(x, y) & TileBits.REVEALED:
+            return BoardDelta()
+        state = self.tile_state(x, y) ^ TileBits.FLAGGED
+        self.set_state(x, y, state)
+        self.flags_placed += 1 if state & TileBits.FLAGGED else -1
+        return self.publish(self.make_delta([y * self.config.grid_width + x]))
+
+    def flag_many(self, cells, flagged: bool = True) -> BoardDelta:
+        """Sets or clears the flag on every listed hidden tile as one published delta.
+
+        Unlike toggle_flag this is idempotent: tiles off the board, revealed
+        or already in the requested state are skipped.
+        """
+        wanted = TileBits.FLAGGED if flagged else 0
+        changed = []
+        for x, y in cells:
+            x, y = int(x), int(y)
+            if not self.in_bounds(x, y):
+                continue
+            state = self.tile_state(x, y)
+            if state & TileBits.REVEALED or (state & TileBits.FLAGGED) == wanted:
+                continue
+            self.set_state(x, y, state ^ TileBits.FLAGGED)
+            self.flags_placed += 1 if flagged else -1
+            changed.append(y * self.config.grid_width + x)
+        return self.publish(self.make_delta(changed))
+
+    def apply_states(self, delta: BoardDelta) -> BoardDelta:
+        """Sets the REVEALED and FLAGGED bits of tiles to the visible states in delta.
+
+        Used to undo and redo moves; mines and counts are left alone. The
+        change is published like any other mutation.
+        """
+        indices = list(delta.indices)
+        previous = self.make_delta(indices).states
+        width = self.config.grid_width
+        player_bits = TileBits.REVEALED | TileBits.FLAGGED
+        for index, state in delta:
+            y, x = divmod(index, width)
+            old = self.tile_state(x, y)
+            new = (old & ~player_bits) | (state & player_bits)
+            if not old & TileBits.MINE:
+                self.safe_tiles_left -= bool(new & TileBits.REVEALED) - bool(old & TileBits.REVEALED)
+            self.flags_placed += bool(new & TileBits.FLAGGED) - bool(old & TileBits.FLAGGED)
+            self.set_state(x, y, new)
+        return self.publish(self.make_delta(indices), previous)
+
+    def make_delta(self, indices: List[int]) -> BoardDelta:
+        """Builds a BoardDelta from the current state of the given flat tiles."""
+        width = self.config.grid_width
+        states = bytearray()
+        for index in indices:
+            state = self.tile_state(index % width, index // width)
+            states.append(state if state & TileBits.REVEALED else state & TileBits.FLAGGED)
+        return BoardDelta(array('q', indices), bytes(states))
+
+    def full_delta(self) -> BoardDelta:
+        """Returns an unpublished delta of every tile in its current visible state."""
+        states = np.concatenate([self.read_chunk(chunk) for chunk in range(self.num_chunks)])
+        states = states.reshape(-1)
+        visible = np.where(states & TileBits.REVEALED, states, states & TileBits.FLAGGED)
+        return BoardDelta(array('q', np.arange(states.size, dtype=np.int64).tobytes()),
+                          visible.astype(np.uint8).tobytes())
+
+    @property
+    def num_chunks(self) -> int:
+        """Number of CHUNK_ROWS-row chunks covering the board."""
+        return -(-self.config.grid_height // self.CHUNK_ROWS)
+
+    def check_victory(self) -> bool:
+        """Checks if all non-mine tiles have been revealed."""
+        return self.safe_tiles_left == 0
+
+    def count_flags(self) -> int:
+        """Counts the number of flags placed on the board."""
+        return self.flags_placed
+
+    def is_mine(self, x: int, y: int) -> bool:
+        """Returns True if the tile holds a mine."""
+        return bool(self.tile_state(x, y) & TileBits.MINE)
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        """Returns True if the tile has been revealed."""
+        return bool(self.tile_state(x, y) & TileBits.REVEALED)
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        """Returns True if the tile carries a flag."""
+        return bool(self.tile_state(x, y) & TileBits.FLAGGED)
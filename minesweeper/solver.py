@@ -0,0 +1,224 @@
+"""Deterministic constraint-propagation solver over the frontier."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .config import TileBits
+from .feed import BoardDelta, FeedFollower
+from .frontier import Frontier
+
+
+class Solver(FeedFollower):
+    """Safe tiles and mines that follow from the visible board, kept current per move.
+
+    Every frontier number gives one constraint: its hidden, unflagged
+    neighbors hold exactly `remaining` mines, its count minus the flags
+    (and revealed mines) around it. Flags are trusted as mines. Two rules
+    run to a fixed point through a worklist:
+
+    - single tile: remaining == 0 makes every unknown safe, remaining ==
+      the number of unknowns makes every unknown a mine;
+    - pairs: for two constraints sharing tiles, if the difference of their
+      remaining counts equals the tiles only one of them sees, those tiles
+      are mines and the other's own tiles are safe. This covers the subset
+      rule and the 1-1 and 1-2 patterns.
+
+    Deductions are fed back into the constraints they touch, so they chain
+    without the player acting on them. After a move only the constraints
+    within one step of the changed tiles are rebuilt and re-examined; a
+    change that removes information (an unflag, an undo) rebuilds all.
+    `safe` and `mines` hold the deduced flat tile indices that are still
+    hidden and unflagged.
+    """
+
+    def __init__(self, board):
+        # Subscribed first, so the frontier is current when record runs.
+        self.frontier = Frontier(board)
+        super().__init__(board)
+
+    def detach(self):
+        """Stops following the board, and the frontier with it."""
+        super().detach()
+        self.frontier.detach()
+
+    def clear(self):
+        """Forgets all constraints and deductions."""
+        self.frontier.sync()
+        super().clear()
+        self._safe: Set[int] = set()
+        self._mines: Set[int] = set()
+        self.unknown: Dict[int, Set[int]] = {}
+        self.remaining: Dict[int, int] = {}
+        self.watchers: Dict[int, Set[int]] = {}
+        self.pending: deque = deque()
+        self.queued: Set[int] = set()
+
+    @property
+    def safe(self) -> Set[int]:
+        """Tiles proven safe, current even after a reset."""
+        self.sync()
+        return self._safe
+
+    @property
+    def mines(self) -> Set[int]:
+        """Tiles proven to be mines, current even after a reset."""
+        self.sync()
+        return self._mines
+
+    def load(self, delta: BoardDelta):
+        """Derives everything from the frontier, which already holds the full delta."""
+        self.rebuild()
+
+    def rebuild(self):
+        """Derives every constraint and deduction from the current frontier."""
+        self.clear()
+        for number in self.frontier.numbers:
+            self.constrain(number)
+        self.propagate()
+
+    def record(self, delta: BoardDelta):
+        """Change feed callback: re-examines the constraints the delta touched."""
+        if self.board.generation != self.generation:
+            self.rebuild()
+            return
+        indices = np.frombuffer(delta.indices, dtype=np.int64)
+        states = np.frombuffer(delta.states, dtype=np.uint8)
+        # Forward moves only set REVEALED or FLAGGED; a tile left with
+        # neither was unflagged or taken back, which can void deductions.
+        if ((states & (TileBits.REVEALED | TileBits.FLAGGED)) == 0).any():
+            self.rebuild()
+            return
+
+        for tile in indices.tolist():
+            self.forget(tile)
+            self._safe.discard(tile)
+            self._mines.discard(tile)
+        table = self.frontier.geometry.neighbor_table
+        touched = np.unique(np.concatenate((indices, table[:, indices].ravel())))
+        numbers = self.frontier.numbers
+        for tile in touched[touched < self.frontier.geometry.num_cells].tolist():
+            if tile in numbers:
+                self.constrain(tile)
+            elif tile in self.unknown:
+                self.drop(tile)
+        self.propagate()
+
+    def constrain(self, number: int):
+        """(Re)builds the constraint of one frontier number and queues it."""
+        self.drop(number)
+        visible = self.frontier.visible
+        neighbors = self.frontier.geometry.neighbors(number)
+        states = visible[neighbors]
+        hidden = (states & (TileBits.REVEALED | TileBits.FLAGGED)) == 0
+        known_mines = (((states & TileBits.FLAGGED) != 0) |
+                       ((states & (TileBits.REVEALED | TileBits.MINE)) ==
+                        (TileBits.REVEALED | TileBits.MINE)))
+        remaining = int(visible[number] & TileBits.COUNT) - int(np.count_nonzero(known_mines))
+
+        unknown = set()
+        for tile in neighbors[hidden].tolist():
+            if tile in self._mines:
+                remaining -= 1
+            elif tile not in self._safe:
+                unknown.add(tile)
+                self.watchers.setdefault(tile, set()).add(number)
+        self.unknown[number] = unknown
+        self.remaining[number] = remaining
+        self.queue(number)
+
+    def drop(self, number: int):
+        """Removes a constraint and its watcher entries, if present."""
+        for tile in self.unknown.pop(number, ()):
+            self.forget(tile, number)
+        self.remaining.pop(number, None)
+
+    def forget(self, tile: int, number: Optional[int] = None):
+        """Unlinks a tile from one constraint watching it, or from all of them."""
+        watching = self.watchers.get(tile)
+        if watching is None:
+            return
+        if number is None:
+            for other in watching:
+                self.unknown[other].discard(tile)
+            watching.clear()
+        else:
+            watching.discard(number)
+        if not watching:
+            del self.watchers[tile]
+
+    def queue(self, number: int):
+        """Adds a constraint to the worklist once."""
+        if number not in self.queued:
+            self.queued.add(number)
+            self.pending.append(number)
+
+    def propagate(self):
+        """Applies the rules until the worklist is empty."""
+        while self.pending:
+            number = self.pending.popleft()
+            self.queued.discard(number)
+            unknown = self.unknown.get(number)
+            if not unknown:
+                continue
+            remaining = self.remaining[number]
+            if remaining == 0:
+                self.deduce(unknown, is_mine=False)
+            elif remaining == len(unknown):
+                self.deduce(unknown, is_mine=True)
+            else:
+                self.compare(number)
+
+    def compare(self, number: int):
+        """Applies the pair rule between one constraint and every overlapping one."""
+        unknown = self.unknown[number]
+        partners = set()
+        for tile in unknown:
+            partners |= self.watchers[tile]
+        partners.discard(number)
+        for other in partners:
+            theirs = self.unknown.get(other)
+            if not theirs:
+                continue
+            mine_only, theirs_only = unknown - theirs, theirs - unknown
+            if not (mine_only or theirs_only):
+                continue
+            difference = self.remaining[other] - self.remaining[number]
+            if difference == len(theirs_only):
+                self.deduce(theirs_only, is_mine=True)
+                self.deduce(mine_only, is_mine=False)
+            elif -difference == len(mine_only):
+                self.deduce(mine_only, is_mine=True)
+                self.deduce(theirs_only, is_mine=False)
+            else:
+                continue
+            # Both constraints changed; re-examine this one later.
+            self.queue(number)
+            return
+
+    def deduce(self, tiles: Iterable[int], is_mine: bool):
+        """Records deductions and folds them into every constraint watching them."""
+        found = self._mines if is_mine else self._safe
+        for tile in list(tiles):
+            found.add(tile)
+            for number in self.watchers.pop(tile, ()):
+                self.unknown[number].discard(tile)
+                if is_mine:
+                    self.remaining[number] -= 1
+                self.queue(number)
+
+    def hint(self) -> Optional[Tuple[int, int]]:
+        """Returns the (x, y) of a tile proven safe, or None."""
+        self.sync()
+        if not self._safe:
+            return None
+        y, x = divmod(min(self._safe), self.board.config.grid_width)
+        return x, y
+
+    def constraints(self) -> List[Tuple[Set[int], int]]:
+        """Returns the open (unknown tiles, remaining mines) constraints."""
+        self.sync()
+        return [(set(unknown), self.remaining[number])
+                for number, unknown in self.unknown.items() if unknown]
@@ -0,0 +1,150 @@
+"""Game state shared by the front-end and headless players."""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # Only the "bitboard" backend is available without NumPy.
+    np = None
+
+from .config import GameConfig
+from .feed import BoardDelta
+from .journal import MoveJournal
+from .backends import new_board
+from .pool import BoardPool
+
+
+class MoveResult:
+    """Aggregate outcome of one batch move.
+
+    delta holds the tiles the batch changed (not the mines uncovered
+    afterwards by a loss), hit_mine whether it revealed a mine and won
+    whether the game is won.
+    """
+
+    __slots__ = ("delta", "hit_mine", "won")
+
+    def __init__(self, delta: Optional[BoardDelta] = None, hit_mine: bool = False,
+                 won: bool = False):
+        self.delta = delta if delta is not None else BoardDelta()
+        self.hit_mine = hit_mine
+        self.won = won
+
+    def __repr__(self) -> str:
+        return f"MoveResult({len(self.delta)} tiles, hit_mine={self.hit_mine}, won={self.won})"
+
+
+class GameState:
+    def __init__(self, config: GameConfig, board_pool: Optional[BoardPool] = None):
+        self.config = config
+        self.board_pool = board_pool
+        self.board = new_board(config)
+        self.journal = MoveJournal(self.board) if config.practice else None
+        self.first_click = True
+        self.game_over = False
+        self.game_won = False
+        self.start_time = 0
+
+    def reset(self):
+        """Resets the game state, clearing the existing board in place."""
+        self.board.reset()
+        if self.journal:
+            self.journal.clear()
+        self.first_click = True
+        self.game_over = False
+        self.game_won = False
+        self.start_time = 0
+
+    def handle_first_click(self, x: int, y: int):
+        """Handles the first click by placing mines and calculating neighbors."""
+        if self.first_click:
+            self.start_time = time.time()
+            if not (self.board_pool and self.board_pool.deal(self.board, (x, y))):
+                self.board.place_mines((x, y))
+                self.board.calculate_neighbor_mines()
+                self.board.label_openings()
+            self.first_click = False
+
+    @contextmanager
+    def move(self):
+        """Records everything published inside the block as one journal move."""
+        if self.journal:
+            with self.journal.move():
+                yield
+        else:
+            yield
+
+    def reveal(self, x: int, y: int):
+        """Reveals a tile, settling loss or victory."""
+        self.handle_first_click(x, y)
+        with self.move():
+            self.settle(self.board.reveal_tile(x, y))
+
+    def chord(self, x: int, y: int):
+        """Chords on a numbered tile, settling loss or victory once for the batch."""
+        if self.first_click:
+            return
+
+        with self.move():
+            self.settle(self.board.chord(x, y))
+
+    def reveal_many(self, cells) -> MoveResult:
+        """Reveals a batch of (x, y) cells as one move and reports the outcome.
+
+        On the first move the first listed cell counts as the first click.
+        Once the game is over the batch is ignored.
+        """
+        if self.game_over or self.game_won:
+            return MoveResult(won=self.game_won)
+        # Read twice below, so a one-shot iterator is materialized first.
+        cells = cells if np is not None and isinstance(cells, np.ndarray) else list(cells)
+        if self.first_click:
+            if not len(cells):
+                return MoveResult()
+            self.handle_first_click(int(cells[0][0]), int(cells[0][1]))
+
+        with self.move():
+            delta = self.settle(self.board.reveal_many(cells))
+        return MoveResult(delta, self.game_over, self.game_won)
+
+    def flag_many(self, cells, flagged: bool = True) -> MoveResult:
+        """Sets or clears the flags on a batch of (x, y) cells as one move."""
+        if self.game_over or self.game_won:
+            return MoveResult(won=self.game_won)
+        with self.move():
+            delta = self.board.flag_many(cells, flagged)
+        return MoveResult(delta)
+
+    def settle(self, delta: BoardDelta) -> BoardDelta:
+        """Ends the game if a reveal hit a mine or opened the last safe tile."""
+        if delta.has_mine():
+            self.game_over = True
+            self.board.reveal_all_mines()
+        elif delta and self.board.check_victory():
+            self.game_won = True
+        return delta
+
+    def undo(self):
+        """Takes back the last move in practice mode, including a losing one."""
+        if self.journal and self.journal.undo():
+            self.game_over = self.game_won = False
+
+    def redo(self):
+        """Replays the last undone move in practice mode."""
+        if self.journal:
+            deltas = self.journal.redo()
+            self.game_over = any(delta.has_mine() for delta in deltas)
+            self.game_won = not self.game_over and self.board.check_victory()
+
+    def get_elapsed_time(self) -> float:
+        """Returns elapsed time since game start."""
+        if self.start_time > 0 and not self.game_over and not self.game_won:
+            return time.time() - self.start_time
+        return 0
+
+    def get_mines_left(self) -> int:
+        """Returns number of mines left (total mines - flags placed)."""
+        return self.config.num_mines - self.board.count_flags()
@@ -0,0 +1,35 @@
+"""Checks that seeded MemmapBoard layouts match the in-memory backends."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import GameConfig, new_board  # noqa: E402
+from minesweeper.memmap import MemmapBoard  # noqa: E402
+
+
+def mines_of(board):
+    width, height = board.config.grid_width, board.config.grid_height
+    return [y * width + x for y in range(height) for x in range(width) if board.is_mine(x, y)]
+
+
+@pytest.mark.parametrize("key_tiles", [7, 64, 1 << 20])
+def test_seeded_layout_matches_board_and_bitboard(tmp_path, key_tiles):
+    rng = random.Random(key_tiles)
+    for _ in range(20):
+        width, height = rng.randint(1, 40), rng.randint(1, 40)
+        config = GameConfig.custom(width, height, rng.randint(0, max(0, width * height - 9)))
+        config.seed = rng.getrandbits(70)
+        click = (rng.randrange(width), rng.randrange(height))
+
+        board = MemmapBoard(config, str(tmp_path / "board"))
+        board.KEY_TILES = key_tiles
+        board.place_mines(click)
+        for backend in ("numpy", "bitboard"):
+            config.backend = backend
+            expected = new_board(config)
+            expected.place_mines(click)
+            assert mines_of(board) == mines_of(expected)
@@ -0,0 +1,74 @@
+"""Checks that BoardPool deals every entry, uniformly and fully prepared."""
+import collections
+import os
+import random
+import sys
+from collections import deque
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import BoardPool, Difficulty, GameConfig, TileBits, new_board  # noqa: E402
+
+
+def mines_of(board):
+    width, height = board.config.grid_width, board.config.grid_height
+    return tuple(y * width + x for y in range(height) for x in range(width) if board.is_mine(x, y))
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitboard"])
+def test_deal_is_uniform(backend):
+    random.seed(1)
+    config = GameConfig.custom(3, 2, 2)
+    config.safe_zone_radius = 0
+    config.backend = backend
+    pool = BoardPool()
+    counts = collections.Counter()
+    for _ in range(10000):
+        pool.entries[pool.key(config)] = deque([pool.prepare(config)])
+        board = new_board(config)
+        assert pool.deal(board, (0, 0))
+        counts[mines_of(board)] += 1
+    # Every 2-subset of the five tiles other than (0, 0), 1000 times each.
+    assert len(counts) == 10
+    assert all(850 < count < 1150 for count in counts.values())
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitboard"])
+def test_every_entry_deals_a_fitting_board(backend):
+    random.seed(2)
+    config = GameConfig(Difficulty.HARD)
+    config.backend = backend
+    width, height = config.grid_width, config.grid_height
+    pool = BoardPool()
+    pool.entries[pool.key(config)] = deque(pool.prepare(config) for _ in range(40))
+    rng = random.Random(2)
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        board = new_board(config)
+        assert pool.deal(board, (x, y))
+        mines = mines_of(board)
+        assert len(mines) == config.num_mines
+        assert not any(abs(m % width - x) <= 1 and abs(m // width - y) <= 1 for m in mines)
+
+        fresh = new_board(config)
+        fresh.move_mines([], list(mines))
+        fresh.label_openings()
+        assert all(board.tile_state(i % width, i // width) == fresh.tile_state(i % width, i // width)
+                   for i in range(width * height))
+        if backend == "numpy":
+            assert np.array_equal(board.opening_labels, fresh.opening_labels)
+            assert np.array_equal(board.opening_cells, fresh.opening_cells)
+    assert not pool.deal(new_board(config), (0, 0))
+
+
+def test_seeded_boards_are_not_dealt():
+    config = GameConfig(Difficulty.EASY)
+    config.seed = 5
+    pool = BoardPool()
+    pool.entries[pool.key(config)] = deque([pool.prepare(config)])
+    board = new_board(config)
+    assert not pool.deal(board, (0, 0))
+    assert not (board.cells & TileBits.MINE).any()
@@ -0,0 +1,124 @@
+"""Checks mine_probabilities against brute-force enumeration."""
+import itertools
+import math
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import (ComponentTooLarge, GameConfig, GameState, Solver,  # noqa: E402
+                         TileBits, mine_probabilities)
+from minesweeper.probability import Component  # noqa: E402
+
+
+def brute_force(board):
+    """Returns {tile: probability} of every hidden, unflagged tile.
+
+    None if no layout fits, or if there are too many to enumerate.
+    """
+    geometry = board.geometry
+    width = board.config.grid_width
+    states = [board.tile_state(i % width, i // width) for i in range(geometry.num_cells)]
+    hidden = [i for i, state in enumerate(states)
+              if not state & (TileBits.REVEALED | TileBits.FLAGGED)]
+    known = {i for i, state in enumerate(states)
+             if state & TileBits.FLAGGED or
+             state & (TileBits.REVEALED | TileBits.MINE) == TileBits.REVEALED | TileBits.MINE}
+    numbers = [(state & TileBits.COUNT, geometry.neighbors(i).tolist())
+               for i, state in enumerate(states)
+               if state & (TileBits.REVEALED | TileBits.MINE) == TileBits.REVEALED]
+    needed = board.config.num_mines - len(known)
+    if math.comb(len(hidden), needed) > 100_000:
+        return None
+    counts = dict.fromkeys(hidden, 0)
+    layouts = 0
+    for combo in itertools.combinations(hidden, needed):
+        mines = known | set(combo)
+        if all(sum(tile in mines for tile in around) == count for count, around in numbers):
+            layouts += 1
+            for tile in combo:
+                counts[tile] += 1
+    if not layouts:
+        return None
+    return {tile: count / layouts for tile, count in counts.items()}
+
+
+def small_positions(count, seed):
+    """Yields (board, solver) for random small positions a few moves into a game."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    found = 0
+    while found < count:
+        width, height = rng.randint(3, 6), rng.randint(3, 6)
+        config = GameConfig.custom(width, height, rng.randint(2, width * height // 3))
+        config.topology = rng.choice(["square", "square", "hex", "torus"])
+        config.safe_zone_radius = rng.choice([0, 1])
+        game = GameState(config)
+        solver = Solver(game.board)
+        game.reveal(rng.randrange(width), rng.randrange(height))
+        for _ in range(rng.randint(0, 4)):
+            if game.game_over or game.game_won:
+                break
+            if solver.safe and rng.random() < 0.6:
+                tile = min(solver.safe)
+                game.reveal_many([(tile % width, tile // width)])
+            elif solver.mines and rng.random() < 0.5:
+                game.flag_many([(tile % width, tile // width) for tile in solver.mines])
+            else:
+                hidden = [(x, y) for y in range(height) for x in range(width)
+                          if not (game.board.is_revealed(x, y) or game.board.is_flagged(x, y) or
+                                  game.board.is_mine(x, y))]
+                if hidden:
+                    game.reveal_many([rng.choice(hidden)])
+        if game.game_over or game.game_won:
+            continue
+        found += 1
+        yield game.board, solver
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed):
+    for board, solver in small_positions(40, seed):
+        expected = brute_force(board)
+        if expected is None:
+            continue
+        probabilities = mine_probabilities(solver)
+        for tile, probability in expected.items():
+            assert probabilities[tile] == pytest.approx(probability, abs=1e-12)
+
+
+def test_probabilities_sum_to_mines_left_on_large_board():
+    random.seed(7)
+    width, height = 200, 200
+    game = GameState(GameConfig.custom(width, height, 8000))
+    solver = Solver(game.board)
+    game.reveal_many([(width // 2, height // 2)])
+    rng = random.Random(7)
+    for _ in range(30):
+        if game.game_over:
+            break
+        if solver.safe:
+            game.reveal_many([(tile % width, tile // width) for tile in solver.safe])
+        else:
+            hidden = [(x, y) for y in range(height) for x in range(width)
+                      if not game.board.is_revealed(x, y) and not game.board.is_mine(x, y)]
+            game.reveal_many([rng.choice(hidden)])
+
+    probabilities = mine_probabilities(solver)
+    visible = solver.frontier.visible[:-1]
+    hidden = int(((visible & (TileBits.REVEALED | TileBits.FLAGGED)) == 0).sum())
+    interior = hidden - len(probabilities.cells)
+    expected = sum(probabilities.cells.values()) + interior * probabilities.interior
+    assert expected == pytest.approx(game.config.num_mines - game.board.count_flags())
+    assert all(0 <= p <= 1 + 1e-12 for p in probabilities.cells.values())
+
+
+def test_component_too_large_is_raised_early():
+    chain = [({i, i + 1, i + 2}, 1) for i in range(6000)]
+    with pytest.raises(ComponentTooLarge) as error:
+        Component(chain, budget=10).solve()
+    assert error.value.tiles == 6002
+    assert error.value.constraints == 6000
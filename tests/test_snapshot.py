@@ -0,0 +1,87 @@
+"""Checks that a NumPy fork plays like a Board and can be followed by a Solver."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import BoardDelta, GameConfig, Solver, new_board  # noqa: E402
+
+
+def copy_of(board):
+    """A separate Board with the same layout and visible state."""
+    width, height = board.config.grid_width, board.config.grid_height
+    copy = new_board(board.config)
+    copy.move_mines([], [y * width + x for y in range(height) for x in range(width)
+                         if board.is_mine(x, y)])
+    copy.label_openings()
+    copy.apply_states(board.full_delta())
+    return copy
+
+
+@pytest.mark.parametrize("topology", ["square", "torus", "hex"])
+def test_fork_plays_like_a_board(topology):
+    rng = random.Random(topology)
+    random.seed(topology)
+    for _ in range(10):
+        width, height = rng.randint(3, 40), rng.randint(3, 40)
+        config = GameConfig.custom(width, height, rng.randint(1, width * height // 5 + 1))
+        config.topology = topology
+        board = new_board(config)
+        board.place_mines((0, 0))
+        board.calculate_neighbor_mines()
+        board.label_openings()
+        board.reveal_tile(0, 0)
+        fork, expected = board.fork(), copy_of(board)
+        history = []
+        for _ in range(40):
+            cells = [(rng.randrange(-1, width + 1), rng.randrange(-1, height + 1))
+                     for _ in range(rng.randint(1, 4))]
+            move = rng.choice(["reveal_many", "flag_many", "unflag", "chord", "toggle", "undo"])
+            if move == "reveal_many":
+                args, kwargs = (cells,), {}
+            elif move in ("flag_many", "unflag"):
+                move, args, kwargs = "flag_many", (cells,), {"flagged": move == "flag_many"}
+            elif move == "undo":
+                if not history:
+                    continue
+                move, args, kwargs = "apply_states", (history.pop(),), {}
+            else:
+                move = "toggle_flag" if move == "toggle" else move
+                args, kwargs = cells[0], {}
+            before = fork.full_delta().states
+            got = getattr(fork, move)(*args, **kwargs)
+            want = getattr(expected, move)(*args, **kwargs)
+            assert sorted(got) == sorted(want)
+            if got and move != "apply_states":
+                history.append(BoardDelta(got.indices, bytes(before[i] for i in got.indices)))
+            assert fork.full_delta().states == expected.full_delta().states
+            assert (fork.safe_tiles_left, fork.flags_placed, fork.zobrist) == \
+                (expected.safe_tiles_left, expected.flags_placed, expected.zobrist)
+        fork.reveal_all_mines()
+        expected.reveal_all_mines()
+        assert fork.full_delta().states == expected.full_delta().states
+
+
+def test_solver_follows_a_numpy_fork():
+    random.seed(3)
+    config = GameConfig.custom(30, 16, 99)
+    board = new_board(config)
+    board.place_mines((15, 8))
+    board.calculate_neighbor_mines()
+    board.label_openings()
+    board.reveal_tile(15, 8)
+    fork = board.fork()
+    solver, parent = Solver(fork), Solver(board)
+    assert (solver.safe, solver.mines) == (parent.safe, parent.mines)
+    while solver.safe:
+        tile = min(solver.safe)
+        fork.reveal_tile(tile % 30, tile // 30)
+        assert not fork.is_mine(tile % 30, tile // 30)
+        fresh = Solver(fork)
+        fresh.detach()
+        assert (solver.safe, solver.mines) == (fresh.safe, fresh.mines)
+    # Moves on the fork never reach the parent or its solver.
+    assert (parent.safe, parent.mines) != (solver.safe, solver.mines)
@@ -0,0 +1,84 @@
+"""Checks the incremental solver against the hidden layout and a fresh solve."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import Frontier, GameConfig, GameState, Solver  # noqa: E402
+
+
+def check(game, solver):
+    """Deductions are correct, current, and the same as a from-scratch solve."""
+    board = game.board
+    width = board.config.grid_width
+    for tiles, is_mine in ((solver.safe, False), (solver.mines, True)):
+        for tile in tiles:
+            x, y = tile % width, tile // width
+            assert board.is_mine(x, y) == is_mine
+            assert not board.is_revealed(x, y) and not board.is_flagged(x, y)
+    fresh = Solver(board)
+    fresh.detach()
+    assert (fresh.safe, fresh.mines) == (solver.safe, solver.mines)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_play_matches_layout_and_fresh_solve(seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    for _ in range(25):
+        width, height = rng.randint(3, 20), rng.randint(3, 20)
+        backend = rng.choice(["numpy", "bitboard"])
+        config = GameConfig.custom(width, height, rng.randint(1, width * height // 4 + 1))
+        config.backend = backend
+        config.practice = True
+        if backend == "numpy":
+            config.topology = rng.choice(["square", "square", "torus", "hex"])
+        game = GameState(config)
+        solver = Solver(game.board)
+        game.reveal(rng.randrange(width), rng.randrange(height))
+        for _ in range(60):
+            solver.sync()
+            check(game, solver)
+            if game.game_over or game.game_won:
+                if rng.random() < 0.5:
+                    game.undo()
+                    continue
+                break
+            hidden = [(x, y) for y in range(height) for x in range(width)
+                      if not game.board.is_revealed(x, y)]
+            move = rng.random()
+            if move < 0.55 and solver.safe:
+                tile = rng.choice(sorted(solver.safe))
+                game.reveal(tile % width, tile // width)
+            elif move < 0.75 and solver.mines:
+                mines = rng.sample(sorted(solver.mines), min(3, len(solver.mines)))
+                game.flag_many([(tile % width, tile // width) for tile in mines])
+            elif move < 0.8:
+                game.undo()
+            elif move < 0.83:
+                flagged = [(x, y) for x, y in hidden if game.board.is_flagged(x, y)]
+                if flagged:
+                    game.board.toggle_flag(*rng.choice(flagged))
+            elif move < 0.85:
+                game.reset()
+            elif hidden:
+                x, y = rng.choice(hidden)
+                if not game.board.is_flagged(x, y) and not game.board.is_mine(x, y):
+                    game.reveal(x, y)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitboard"])
+def test_followers_read_empty_right_after_reset(backend):
+    random.seed(4)
+    config = GameConfig.custom(16, 16, 40)
+    config.backend = backend
+    game = GameState(config)
+    frontier, solver = Frontier(game.board), Solver(game.board)
+    game.reveal(8, 8)
+    assert frontier.cells and frontier.numbers
+    game.reset()
+    assert (frontier.cells, frontier.numbers) == (set(), set())
+    assert (solver.safe, solver.mines) == (set(), set())
@@ -0,0 +1,40 @@
+"""Checks GameState batch moves."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from minesweeper import Difficulty, GameConfig, GameState  # noqa: E402
+
+
+def visible(game):
+    return bytes(game.board.full_delta().states)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitboard"])
+def test_reveal_many_accepts_a_generator(backend):
+    config = GameConfig.custom(9, 9, 25)
+    config.backend = backend
+    config.seed = 0
+    cells = [(4, 4), (0, 0), (8, 8), (0, 8)]
+    by_list, by_generator = GameState(config), GameState(config)
+    expected = by_list.reveal_many(cells)
+    result = by_generator.reveal_many(cell for cell in cells)
+    assert sorted(result.delta) == sorted(expected.delta)
+    assert (result.hit_mine, result.won) == (expected.hit_mine, expected.won)
+    assert visible(by_generator) == visible(by_list)
+    # The first cell is both the first click and part of the batch.
+    assert by_generator.board.is_revealed(4, 4)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitboard"])
+def test_reveal_many_ignores_an_empty_first_batch(backend):
+    random.seed(1)
+    config = GameConfig(Difficulty.EASY)
+    config.backend = backend
+    game = GameState(config)
+    assert not game.reveal_many(iter([])).delta
+    assert game.first_click